@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Smoke check: run the batch pipeline end to end on an inline feed, offline.
+
+Calls `run_publication` (dry run, then a full run, each with and without
+tracing) in a temporary project directory. ElevenLabs is replaced by a
+client that returns silent MP3 frames, so no credentials or credits are
+needed. Exits non-zero on the first failure.
+
+Usage: python scripts/smoke_check.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from substack_to_spotify import run_publication  # noqa: E402
+
+from substack_audio.trace import start_tracing, stop_tracing  # noqa: E402
+
+# One MPEG-1 Layer III frame, 128 kbps / 44.1 kHz: 417 bytes, ~26 ms.
+_FRAME = b"\xff\xfb\x90\x00" + bytes(413)
+
+_FEED = """<?xml version="1.0"?>
+<rss xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+<item><title>Smoke post one</title><link>https://smoke.example/p/one</link>
+<guid>smoke-1</guid><pubDate>Mon, 05 Jan 2026 10:00:00 GMT</pubDate>
+<description>First</description>
+<content:encoded><![CDATA[<p>The first post has a little text.</p><p>Share</p>]]></content:encoded></item>
+<item><title>Smoke post two</title><link>https://smoke.example/p/two</link>
+<guid>smoke-2</guid><pubDate>Tue, 06 Jan 2026 10:00:00 GMT</pubDate>
+<description>Second</description>
+<content:encoded><![CDATA[<p>The second post has a little more text to read.</p>]]></content:encoded></item>
+</channel></rss>
+"""
+
+
+class _TextToSpeech:
+    def convert(self, text, voice_id, model_id, output_format):
+        return _FRAME * 20
+
+
+class _FakeElevenLabs:
+    text_to_speech = _TextToSpeech()
+
+
+def _settings(root: Path) -> dict:
+    return {
+        "ELEVENLABS_API_KEY": "smoke",
+        "ELEVENLABS_VOICE_ID": "smoke-voice",
+        "PUBLIC_BASE_URL": "https://smoke.example/podcast",
+        "SUBSTACK_FEED_URL": "https://smoke.example/feed",
+        "STATE_FILE": str(root / "data" / "state.json"),
+        "EPISODES_FILE": str(root / "data" / "episodes.json"),
+        "OUTPUT_AUDIO_DIR": str(root / "output" / "public" / "audio"),
+        "OUTPUT_FEED_FILE": str(root / "output" / "public" / "feed.xml"),
+        "FEED_CACHE_DIR": str(root / "data" / "feed_cache"),
+        "AUDIO_BLOB_DIR": str(root / "output" / "blobs"),
+        "PUBLISH_MANIFEST_FILE": str(root / "data" / "publish_manifest.json"),
+    }
+
+
+def _run(root: Path, dry_run: bool, trace: bool) -> None:
+    settings = _settings(root)
+    if trace:
+        start_tracing(root / "trace.jsonl")
+    try:
+        run_publication(
+            settings,
+            dry_run=dry_run,
+            name="smoke",
+            clients={"smoke": _FakeElevenLabs()},
+            feed_xml=_FEED,
+        )
+    finally:
+        stop_tracing()
+
+
+def main() -> None:
+    for trace in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _run(root, dry_run=True, trace=trace)
+            _run(root, dry_run=False, trace=trace)
+
+            episodes = json.loads((root / "data" / "episodes.json").read_text(encoding="utf-8"))
+            state = json.loads((root / "data" / "state.json").read_text(encoding="utf-8"))
+            assert len(episodes) == 2, episodes
+            assert sorted(state["processed_guids"]) == ["smoke-1", "smoke-2"], state
+            for ep in episodes:
+                audio = root / "output" / "public" / "audio" / ep["audio_file"]
+                assert audio.exists() and os.path.getsize(audio) > 0, ep
+                assert ep.get("audio_sha256"), ep
+            assert (root / "output" / "public" / "feed.xml").exists()
+            if trace:
+                assert (root / "trace.jsonl").stat().st_size > 0
+    print("smoke check passed", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,180 +1,723 @@
 #!/usr/bin/env python3
-"""CLI entrypoint: batch-process Substack RSS feed into podcast episodes."""
-
+"""CLI entrypoint: batch-process Substack RSS feeds into podcast episodes."""
+
+import argparse
+import contextvars
+import heapq
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Container, Dict, Iterator, List, Mapping, Optional
 
 import requests
 from dotenv import load_dotenv
 from elevenlabs.client import ElevenLabs
 
-from substack_audio.config import env, env_bool, parse_csv
+from substack_audio.blobstore import store_audio
+from substack_audio.config import env, env_bool, feed_config, load_publications, parse_csv
+from substack_audio.events import EVENT_FORMATS, emit, events_enabled, start_events, stop_events
+from substack_audio.extract import iter_prepared
 from substack_audio.feed import build_audio_url, build_feed
-from substack_audio.fetch import fetch_archive_json, fetch_feed_xml, fetch_posts_json
+from substack_audio.feedcache import cache_feed
+from substack_audio.fetch import (
+    fetch_archive_json,
+    fetch_feed_xml,
+    fetch_posts_json,
+    make_session,
+    poll_feed,
+)
+from substack_audio.hls import HlsPlaylist
+from substack_audio.integrity import hash_audio
 from substack_audio.parse import (
-    parse_archive_json,
-    parse_posts_json,
-    parse_rss,
-    select_items,
-    strip_html_to_text,
+    iter_posts_json,
+    iter_rss,
+    iter_select_items,
 )
-from substack_audio.tts import concat_mp3, elevenlabs_tts, split_text
-from substack_audio.util import load_json, parse_pub_date, save_json, slugify
-
-
-def main() -> None:
-    load_dotenv()
-
-    api_key = env("ELEVENLABS_API_KEY")
-    voice_id = env("ELEVENLABS_VOICE_ID")
-    model_id = env("ELEVENLABS_MODEL_ID", "eleven_v3")
-    output_format = env("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
-    text_limit = int(env("ELEVENLABS_TEXT_LIMIT", "4500"))
-
-    feed_url = env("SUBSTACK_FEED_URL", "https://ovidiueftimie.substack.com/feed")
-    max_posts = int(env("MAX_POSTS_PER_RUN", "3"))
-    target_articles = parse_csv(env("TARGET_ARTICLES", ""))
-    target_include_processed = env_bool("TARGET_INCLUDE_PROCESSED", True)
-
-    public_base_url = env("PUBLIC_BASE_URL")
-    state_file = Path(env("STATE_FILE", "data/state.json"))
-    episodes_file = Path(env("EPISODES_FILE", "data/episodes.json"))
-    output_audio_dir = Path(env("OUTPUT_AUDIO_DIR", "output/public/audio"))
-    output_feed_file = Path(env("OUTPUT_FEED_FILE", "output/public/feed.xml"))
-
-    if not api_key or not voice_id:
-        raise SystemExit("Missing ELEVENLABS_API_KEY or ELEVENLABS_VOICE_ID")
-    if not public_base_url:
-        raise SystemExit("Missing PUBLIC_BASE_URL")
-
-    elevenlabs_client = ElevenLabs(api_key=api_key)
-
-    output_audio_dir.mkdir(parents=True, exist_ok=True)
-
-    state = load_json(state_file, {"processed_guids": []})
-    processed_guids = set(state.get("processed_guids", []))
-    episodes: List[Dict] = load_json(episodes_file, [])
-
-    print(f"Fetching Substack feed: {feed_url}")
+from substack_audio.postprocess import (
+    check_renditions,
+    output_format_bitrate,
+    postprocess_many,
+    rendition_entry,
+)
+from substack_audio.publish import publish_tree
+from substack_audio.schedule import plan_run
+from substack_audio.textfilter import filter_rules
+from substack_audio.trace import profiled, span, start_tracing, stop_tracing
+from substack_audio.tts import FairLimiter, check_output_format, concat_mp3, synthesize_chunk
+from substack_audio.util import load_json, parse_pub_date, peak_rss_bytes, save_json, slugify
+from substack_audio.watch import near_publish_time, next_interval, parse_retry_after, publish_minutes
+
+
+def make_log(name: str = "") -> Callable[[str], None]:
+    """Print progress lines, prefixed with the publication name if any.
+
+    With --events ndjson, lines become ``log`` events so stdout stays NDJSON.
+    """
+    def log(msg: str) -> None:
+        if events_enabled():
+            emit("log", publication=name, message=msg)
+        elif name:
+            print(f"[{name}] {msg}", flush=True)
+        else:
+            print(msg, flush=True)
+
+    return log
+
+
+def iter_feed_items(
+    feed_url: str,
+    max_posts: int,
+    skip_guids: Optional[Container[str]] = None,
+    session: Optional[requests.Session] = None,
+    log: Callable[[str], None] = print,
+    feed_xml: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[Dict]:
+    """Fetch the feed (with API fallbacks) and return a lazy iterator over its items.
+
+    An already fetched ``feed_xml`` (from a watch-mode poll) is parsed as is.
+    With ``cache_dir`` the payload is also kept there for `fetch_article`.
+    """
+
+    def keep(body: str, source: str) -> str:
+        if cache_dir is not None:
+            cache_feed(cache_dir, feed_url, body, source)
+        return body
+
+    if feed_xml is not None:
+        return iter_rss(keep(feed_xml, "rss"), skip_guids)
+    log(f"Fetching Substack feed: {feed_url}")
     try:
-        feed_xml = fetch_feed_xml(feed_url, timeout=30)
-        items = parse_rss(feed_xml)
+        feed_xml = fetch_feed_xml(feed_url, timeout=30, session=session)
+        return iter_rss(keep(feed_xml, "rss"), skip_guids)
     except requests.HTTPError as exc:
         status = exc.response.status_code if exc.response is not None else None
         if status != 403:
             raise
-        print("RSS feed returned 403, falling back to Substack posts API...")
+        log("RSS feed returned 403, falling back to Substack posts API...")
         try:
-            posts_json = fetch_posts_json(feed_url, max_posts=max_posts, timeout=30)
-            items = parse_posts_json(posts_json)
+            posts_json = fetch_posts_json(
+                feed_url, max_posts=max_posts, timeout=30, session=session
+            )
+            return iter_posts_json(keep(posts_json, "posts_api"), skip_guids)
         except requests.HTTPError:
-            print("Posts API returned 403, falling back to Substack archive API...")
-            archive_json = fetch_archive_json(feed_url, timeout=30)
-            items = parse_archive_json(archive_json)
-
-    if not items:
-        print("No items found in RSS feed.")
-    if target_articles:
-        print(f"Cherry-pick mode enabled with {len(target_articles)} selector(s).")
-        new_items = select_items(items, target_articles)
-        if not target_include_processed:
-            new_items = [it for it in new_items if it["guid"] not in processed_guids]
-        new_items = sorted(new_items, key=lambda x: parse_pub_date(x["pub_date"]))
-        print(f"Matched {len(new_items)} article(s) for processing.")
-    else:
-        new_items = [it for it in items if it["guid"] not in processed_guids]
-        new_items = sorted(new_items, key=lambda x: parse_pub_date(x["pub_date"]))[:max_posts]
-
-    if not new_items:
-        print("No posts to process.")
-
-    for item in new_items:
-        title = item["title"]
-        guid = item["guid"]
-        link = item["link"]
-        pub_dt = parse_pub_date(item["pub_date"])
-        pub_iso = pub_dt.isoformat()
-
-        print(f"Generating audio for: {title}")
-
-        text = strip_html_to_text(item["content_html"])
-        if not text:
-            print(f"Skipping (empty content): {title}")
-            processed_guids.add(guid)
-            continue
-
-        chunks = split_text(text, text_limit)
-        slug = slugify(title)
-        date_prefix = pub_dt.strftime("%Y-%m-%d")
-        base_name = f"{date_prefix}-{slug}"
-
-        part_files: List[Path] = []
-        for idx, chunk in enumerate(chunks, start=1):
-            print(f"  chunk {idx}/{len(chunks)}")
-            audio_bytes = elevenlabs_tts(
-                client=elevenlabs_client,
+            log("Posts API returned 403, falling back to Substack archive API...")
+            archive_json = fetch_archive_json(feed_url, timeout=30, session=session)
+            return iter_posts_json(keep(archive_json, "archive_api"), skip_guids)
+
+
+def synthesize_item(
+    item: Dict,
+    client: ElevenLabs,
+    voice_id: str,
+    model_id: str,
+    output_format: str,
+    output_audio_dir: Path,
+    public_base_url: str,
+    limiter: Optional[FairLimiter] = None,
+    limiter_key: str = "",
+    log: Callable[[str], None] = print,
+    hls_dir: Optional[Path] = None,
+) -> Optional[Dict]:
+    """Synthesize one prepared post (see `prepare_item`) and return its episode entry.
+
+    Returns None if the post has no text. Audio chunks are written to part
+    files as they arrive and only live for the duration of this call. With
+    ``hls_dir``, each chunk is also appended to ``<hls_dir>/<name>/index.m3u8``.
+    """
+    title = item["title"]
+    pub_dt = parse_pub_date(item["pub_date"])
+
+    log(f"Generating audio for: {title}")
+
+    chunks = item["chunks"]
+    if not chunks:
+        log(f"Skipping (empty content): {title}")
+        return None
+    removed = item.get("filter", {}).get("chars_removed", 0)
+    if removed:
+        log(f"  filtered out {removed} of {item['filter']['chars_in']} chars")
+
+    slug = slugify(title)
+    date_prefix = pub_dt.strftime("%Y-%m-%d")
+    base_name = f"{date_prefix}-{slug}"
+
+    playlist = HlsPlaylist(hls_dir / base_name) if hls_dir else None
+    part_files: List[Path] = []
+    for idx, chunk in enumerate(chunks, start=1):
+        log(f"  chunk {idx}/{len(chunks)}")
+        emit("chunk_queued", index=idx, total=len(chunks), chars=len(chunk), guid=item["guid"])
+        with limiter.slot(limiter_key) if limiter else nullcontext():
+            audio_bytes = synthesize_chunk(
+                client=client,
                 voice_id=voice_id,
                 model_id=model_id,
                 output_format=output_format,
                 text=chunk,
+                index=idx,
+                total=len(chunks),
+                guid=item["guid"],
             )
-            part_path = output_audio_dir / f"{base_name}.part{idx}.mp3"
-            part_path.write_bytes(audio_bytes)
-            part_files.append(part_path)
+        part_path = output_audio_dir / f"{base_name}.part{idx}.mp3"
+        part_path.write_bytes(audio_bytes)
+        part_files.append(part_path)
+        if playlist:
+            playlist.add_chunk(audio_bytes)
+        del audio_bytes
+
+    final_audio = output_audio_dir / f"{base_name}.mp3"
+    concat_mp3(part_files, final_audio)
+    if playlist:
+        playlist.close()
+
+    for part in part_files:
+        try:
+            part.unlink()
+        except OSError:
+            pass
+
+    return {
+        "guid": item["guid"],
+        "title": title,
+        "description": item["excerpt"],
+        "author": item.get("author", ""),
+        "link": item["link"],
+        "pub_date_iso": pub_dt.isoformat(),
+        "audio_file": final_audio.name,
+        "audio_url": build_audio_url(public_base_url, final_audio.name),
+        "audio_size_bytes": final_audio.stat().st_size,
+    }
 
-        final_audio = output_audio_dir / f"{base_name}.mp3"
-        concat_mp3(part_files, final_audio)
 
-        for part in part_files:
-            try:
-                part.unlink()
-            except OSError:
-                pass
-
-        excerpt = strip_html_to_text(item["description_html"]).strip()
-        if not excerpt:
-            excerpt = text[:250] + ("..." if len(text) > 250 else "")
-
-        audio_url = build_audio_url(public_base_url, final_audio.name)
-        audio_size = final_audio.stat().st_size
-
-        episodes = [ep for ep in episodes if ep.get("guid") != guid]
-        episodes.append(
-            {
-                "guid": guid,
-                "title": title,
-                "description": excerpt,
-                "author": item.get("author", ""),
-                "link": link,
-                "pub_date_iso": pub_iso,
-                "audio_file": final_audio.name,
-                "audio_url": audio_url,
-                "audio_size_bytes": audio_size,
-            }
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Batch-process a Substack feed into podcast episodes")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the run plan (characters, estimated time) and exit without synthesizing",
+    )
+    parser.add_argument(
+        "--publications",
+        help="JSON file listing several publications to run in one process (default: PUBLICATIONS_FILE)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident: poll the feed(s) adaptively and process new posts as they appear",
+    )
+    parser.add_argument("--trace", metavar="PATH", help="Append span traces (JSONL) to PATH")
+    parser.add_argument(
+        "--events",
+        choices=EVENT_FORMATS,
+        help="Print progress as NDJSON events on stdout instead of log lines",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="batch.prof",
+        metavar="PATH",
+        help="Dump cProfile stats to PATH (default: batch.prof); with --publications, "
+        "one file per publication, e.g. batch.<name>.prof",
+    )
+    return parser
+
+
+def _in_worker(profile: Optional[Path], name: str, fn, *args, **kwargs):
+    """Call ``fn`` in a publication's worker thread, under cProfile if ``profile`` is set.
+
+    cProfile only sees the thread that enables it, so each publication dumps
+    its own ``<stem>.<name><suffix>`` next to ``profile``.
+    """
+    path = profile.with_name(f"{profile.stem}.{slugify(name)}{profile.suffix}") if profile else None
+    with profiled(path):
+        return fn(*args, **kwargs)
+
+
+_manifest_locks: Dict[str, threading.Lock] = {}
+_manifest_locks_guard = threading.Lock()
+
+
+def _manifest_lock(manifest_file: Path) -> threading.Lock:
+    with _manifest_locks_guard:
+        return _manifest_locks.setdefault(str(manifest_file.resolve()), threading.Lock())
+
+
+def run_publication(
+    settings: Mapping[str, str],
+    dry_run: bool = False,
+    name: str = "",
+    session: Optional[requests.Session] = None,
+    clients: Optional[Dict[str, ElevenLabs]] = None,
+    limiter: Optional[FairLimiter] = None,
+    feed_xml: Optional[str] = None,
+) -> None:
+    """Run one publication end to end: fetch, schedule, synthesize, feed, publish.
+
+    ``settings`` holds the publication's `.env`-style keys. The HTTP session,
+    ElevenLabs clients (keyed by API key) and TTS limiter may be shared across
+    publications running in the same process. ``feed_xml`` skips the fetch.
+    """
+    with span("publication", publication=name):
+        _run_publication(settings, dry_run, name, session, clients, limiter, feed_xml)
+
+
+def _run_publication(
+    settings: Mapping[str, str],
+    dry_run: bool,
+    name: str,
+    session: Optional[requests.Session],
+    clients: Optional[Dict[str, ElevenLabs]],
+    limiter: Optional[FairLimiter],
+    feed_xml: Optional[str],
+) -> None:
+    log = make_log(name)
+
+    api_key = env("ELEVENLABS_API_KEY", "", settings)
+    voice_id = env("ELEVENLABS_VOICE_ID", "", settings)
+    model_id = env("ELEVENLABS_MODEL_ID", "eleven_v3", settings)
+    output_format = env("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128", settings)
+    text_limit = int(env("ELEVENLABS_TEXT_LIMIT", "4500", settings))
+
+    feed_url = env("SUBSTACK_FEED_URL", "https://ovidiueftimie.substack.com/feed", settings)
+    max_posts = int(env("MAX_POSTS_PER_RUN", "3", settings))
+    target_articles = parse_csv(env("TARGET_ARTICLES", "", settings))
+    target_include_processed = env_bool("TARGET_INCLUDE_PROCESSED", True, settings)
+
+    public_base_url = env("PUBLIC_BASE_URL", "", settings)
+    state_file = Path(env("STATE_FILE", "data/state.json", settings))
+    episodes_file = Path(env("EPISODES_FILE", "data/episodes.json", settings))
+    output_audio_dir = Path(env("OUTPUT_AUDIO_DIR", "output/public/audio", settings))
+    output_feed_file = Path(env("OUTPUT_FEED_FILE", "output/public/feed.xml", settings))
+    normalize = env_bool("AUDIO_NORMALIZE", False, settings)
+    renditions = parse_csv(env("AUDIO_RENDITIONS", "", settings))
+    # Fail before anything is paid for, not after synthesis.
+    try:
+        check_output_format(output_format)
+        check_renditions(renditions)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    # A dry run only fetches and measures posts, so it needs no credentials.
+    if not dry_run:
+        if not api_key or not voice_id:
+            raise SystemExit("Missing ELEVENLABS_API_KEY or ELEVENLABS_VOICE_ID")
+        if not public_base_url:
+            raise SystemExit("Missing PUBLIC_BASE_URL")
+
+    clients = clients if clients is not None else {}
+    if not dry_run and api_key not in clients:
+        clients[api_key] = ElevenLabs(api_key=api_key)
+    elevenlabs_client = clients.get(api_key)
+
+    if not dry_run:
+        output_audio_dir.mkdir(parents=True, exist_ok=True)
+
+    state = load_json(state_file, {"processed_guids": []})
+    processed_guids = set(state.get("processed_guids", []))
+    episodes: List[Dict] = load_json(episodes_file, [])
+
+    def pub_key(item: Dict):
+        return parse_pub_date(item["pub_date"])
+
+    char_budget = int(env("RUN_CHAR_BUDGET", "0", settings))
+    time_budget = float(env("RUN_TIME_BUDGET_SECONDS", "0", settings))
+    scheduled = bool(char_budget or time_budget or dry_run)
+
+    feed_cache_dir = env("FEED_CACHE_DIR", "data/feed_cache", settings)
+    fetch_kwargs = {
+        "session": session,
+        "log": log,
+        "feed_xml": feed_xml,
+        "cache_dir": Path(feed_cache_dir) if env_bool("FEED_CACHE", True, settings) else None,
+    }
+
+    # Items are parsed lazily; already-processed guids are dropped inside the
+    # parser before their HTML is read, so only the selected posts are retained.
+    with span("parse.select") as sp:
+        if target_articles:
+            log(f"Cherry-pick mode enabled with {len(target_articles)} selector(s).")
+            skip = None if target_include_processed else processed_guids
+            items = iter_feed_items(feed_url, max_posts, skip, **fetch_kwargs)
+            new_items = sorted(iter_select_items(items, target_articles), key=pub_key)
+            log(f"Matched {len(new_items)} article(s) for processing.")
+        elif scheduled:
+            # Budgeted runs need every candidate's size before choosing.
+            items = iter_feed_items(feed_url, max_posts, processed_guids, **fetch_kwargs)
+            new_items = sorted(items, key=pub_key)
+        else:
+            items = iter_feed_items(feed_url, max_posts, processed_guids, **fetch_kwargs)
+            new_items = heapq.nsmallest(max_posts, items, key=pub_key)
+        del items
+        sp.set("candidates", len(new_items))
+
+    rules = filter_rules(settings)
+    extract_workers = int(env("EXTRACT_WORKERS", "0", settings))
+    extract_batch = int(env("EXTRACT_BATCH_SIZE", "8", settings))
+    prepared = scheduled and extract_workers > 1
+    if prepared:
+        # Parse every candidate once, in parallel; the plan then reuses the chunks.
+        new_items = list(
+            iter_prepared(new_items, text_limit, extract_workers, extract_batch, rules)
+        )
+
+    if scheduled:
+        plan = plan_run(
+            new_items,
+            text_limit=text_limit,
+            char_budget=char_budget,
+            time_budget_seconds=time_budget,
+            chars_per_second=float(env("TTS_CHARS_PER_SECOND", "100", settings)),
+            max_posts=0 if target_articles else max_posts,
+            priority=env("SCHEDULE_PRIORITY", "oldest", settings),
+            rules=rules,
+        )
+        if dry_run:
+            if events_enabled():
+                emit("plan", publication=name, **plan)
+            else:
+                print(json.dumps({"publication": name, **plan} if name else plan, indent=2), flush=True)
+            return
+        # Synthesize in pub-date order whatever the scheduling priority.
+        selected = {m["guid"] for m in plan["selected"]}
+        new_items = [it for it in new_items if it["guid"] in selected]
+        log(
+            f"Scheduled {len(new_items)} post(s), {plan['chars_planned']} chars "
+            f"(~{plan['est_seconds_planned']}s); deferred {len(plan['deferred'])}."
         )
 
+    if not new_items:
+        log("No posts to process.")
+
+    # Pop each item as it is handed to extraction so its HTML can be released;
+    # with EXTRACT_WORKERS > 1 the HTML is parsed in a process pool a few
+    # batches ahead of synthesis, otherwise one post at a time. Items the plan
+    # already prepared are not sent to a pool again.
+    hls_dir = output_feed_file.parent / "hls" if env_bool("AUDIO_HLS", False, settings) else None
+    new_episodes: List[Dict] = []
+    queue = deque(new_items)
+    del new_items
+    pending = (queue.popleft() for _ in range(len(queue)))
+    workers = 0 if prepared else extract_workers
+    for item in iter_prepared(pending, text_limit, workers, extract_batch, rules):
+        guid = item["guid"]
+        episode = synthesize_item(
+            item,
+            client=elevenlabs_client,
+            voice_id=voice_id,
+            model_id=model_id,
+            output_format=output_format,
+            output_audio_dir=output_audio_dir,
+            public_base_url=public_base_url,
+            limiter=limiter,
+            limiter_key=name,
+            log=log,
+            hls_dir=hls_dir,
+        )
+        del item
+
+        if episode is not None:
+            episodes = [ep for ep in episodes if ep.get("guid") != guid]
+            episodes.append(episode)
+            new_episodes.append(episode)
+
         processed_guids.add(guid)
 
-    feed_path_url = f"{public_base_url.rstrip('/')}/feed.xml"
-    feed_cfg = {
-        "title": env("PODCAST_TITLE", "Substack Audio"),
-        "description": env("PODCAST_DESCRIPTION", "Audio versions of Substack posts."),
-        "site_link": env("PODCAST_LINK", ""),
-        "author": env("PODCAST_AUTHOR", ""),
-        "email": env("PODCAST_EMAIL", ""),
-        "language": env("PODCAST_LANGUAGE", "en"),
-        "image_url": env("PODCAST_IMAGE_URL", ""),
-        "feed_url": feed_path_url,
-    }
+    if new_episodes and (normalize or renditions):
+        log(f"Post-processing {len(new_episodes)} episode(s)...")
+        results = postprocess_many(
+            [output_audio_dir / ep["audio_file"] for ep in new_episodes],
+            normalize=normalize,
+            renditions=renditions,
+            target_lufs=float(env("AUDIO_LOUDNESS_TARGET", "-16", settings)),
+            bitrate=output_format_bitrate(output_format),
+            max_workers=int(env("AUDIO_POSTPROCESS_WORKERS", "0", settings)) or None,
+        )
+        for ep, result in zip(new_episodes, results):
+            if "error" in result:
+                log(f"Post-processing failed for {ep['audio_file']}: {result['error']}")
+            ep["audio_size_bytes"] = result["audio_size_bytes"]
+            if result["renditions"]:
+                ep["renditions"] = {
+                    rendition: rendition_entry(
+                        output_audio_dir, ep["audio_file"], rendition, public_base_url
+                    )
+                    for rendition in result["renditions"]
+                }
+
+    if env_bool("AUDIO_BLOB_STORE", True, settings):
+        blob_dir = Path(env("AUDIO_BLOB_DIR", "output/blobs", settings))
+        stored = store_audio(new_episodes, output_audio_dir, blob_dir)
+        if stored["bytes_saved"]:
+            log(f"Blob store: {stored['bytes_saved']} bytes of duplicate audio now linked.")
+    else:
+        hash_audio(new_episodes, output_audio_dir, only_missing=False)
+    feed_cfg = feed_config(public_base_url, settings)
 
-    build_feed(episodes, output_feed_file, feed_cfg)
+    if not build_feed(episodes, output_feed_file, feed_cfg):
+        log("Feed content unchanged; left existing files in place.")
 
     save_json(episodes_file, episodes)
     state["processed_guids"] = sorted(processed_guids)
     save_json(state_file, state)
+    emit(
+        "feed_committed",
+        publication=name,
+        feed_path=str(output_feed_file),
+        new_episodes=[ep["guid"] for ep in new_episodes],
+        episodes=len(episodes),
+    )
+
+    publish_target = env("PUBLISH_TARGET_DIR", "", settings)
+    if publish_target:
+        # Per publication by default (next to its state file); publications that
+        # are pointed at one manifest anyway take turns updating it.
+        manifest_file = Path(
+            env("PUBLISH_MANIFEST_FILE", "", settings) or state_file.parent / "publish_manifest.json"
+        )
+        with _manifest_lock(manifest_file):
+            result = publish_tree(
+                source=output_feed_file.parent,
+                target=Path(publish_target),
+                manifest_file=manifest_file,
+            )
+        log(
+            f"Published {result['files_copied']}/{result['files_total']} file(s), "
+            f"{result['bytes_copied']} bytes to: {publish_target}"
+        )
+
+    log(f"Done. Feed written to: {output_feed_file}")
+    log(f"Episodes tracked: {len(episodes)}")
+
+
+def watch_publication(
+    settings: Mapping[str, str],
+    name: str = "",
+    session: Optional[requests.Session] = None,
+    clients: Optional[Dict[str, ElevenLabs]] = None,
+    limiter: Optional[FairLimiter] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Poll one publication's feed until ``stop`` is set, processing new posts at once.
 
-    print(f"Done. Feed written to: {output_feed_file}")
-    print(f"Episodes tracked: {len(episodes)}")
+    Polls are conditional GETs. The interval backs off while nothing changes,
+    drops to ``WATCH_MIN_INTERVAL`` around the times of day recent episodes
+    were published, and never undercuts a server's Retry-After. The session
+    and ElevenLabs clients stay open between polls.
+    """
+    log = make_log(name)
+
+    if not env("ELEVENLABS_API_KEY", "", settings) or not env("ELEVENLABS_VOICE_ID", "", settings):
+        raise SystemExit("Missing ELEVENLABS_API_KEY or ELEVENLABS_VOICE_ID")
+    if not env("PUBLIC_BASE_URL", "", settings):
+        raise SystemExit("Missing PUBLIC_BASE_URL")
+
+    feed_url = env("SUBSTACK_FEED_URL", "https://ovidiueftimie.substack.com/feed", settings)
+    state_file = Path(env("STATE_FILE", "data/state.json", settings))
+    episodes_file = Path(env("EPISODES_FILE", "data/episodes.json", settings))
+    min_interval = float(env("WATCH_MIN_INTERVAL", "120", settings))
+    max_interval = float(env("WATCH_MAX_INTERVAL", "3600", settings))
+    backoff = float(env("WATCH_BACKOFF", "2", settings))
+    window = int(env("WATCH_HOT_WINDOW_MINUTES", "45", settings))
+
+    session = session or make_session()
+    clients = clients if clients is not None else {}
+    stop = stop or threading.Event()
+
+    def process(feed_xml: Optional[str] = None) -> None:
+        run_publication(
+            settings,
+            name=name,
+            session=session,
+            clients=clients,
+            limiter=limiter,
+            feed_xml=feed_xml,
+        )
+
+    # Start with a full run: it catches up on anything published while down.
+    try:
+        process()
+    except Exception as exc:
+        log(f"Initial run failed: {exc}")
+    hot_minutes = publish_minutes(load_json(episodes_file, []))
+    validators: Dict[str, str] = {}
+    # Posts handed to a run but deferred (budgets, MAX_POSTS_PER_RUN) are not
+    # treated as new again until max_interval has passed.
+    attempted: Dict[str, float] = {}
+    interval = min_interval
+
+    while not stop.wait(interval):
+        changed = False
+        retry_after = None
+        try:
+            poll = poll_feed(feed_url, validators, timeout=30, session=session)
+            retry_after = parse_retry_after(poll["retry_after"])
+            if poll["status"] == 200:
+                now = time.monotonic()
+                state = load_json(state_file, {"processed_guids": []})
+                known = set(state.get("processed_guids", []))
+                known.update(g for g, t in attempted.items() if now - t < max_interval)
+                fresh = [item["guid"] for item in iter_rss(poll["body"], known)]
+                if fresh:
+                    log(f"{len(fresh)} new post(s) in feed.")
+                    process(poll["body"])
+                    attempted.update((guid, now) for guid in fresh)
+                    hot_minutes = publish_minutes(load_json(episodes_file, []))
+                    changed = True
+                # Keep the validators only after a successful run and once every
+                # post of this body is processed: a 304 would otherwise hide a
+                # failed or deferred post until the feed changes again.
+                state = load_json(state_file, {"processed_guids": []})
+                backlog = next(iter_rss(poll["body"], set(state.get("processed_guids", []))), None)
+                validators = {} if backlog else poll["validators"]
+            elif poll["status"] in (429, 503):
+                log(f"Feed poll rate-limited (HTTP {poll['status']}).")
+            elif poll["status"] != 304:
+                # e.g. a Cloudflare 403: the full fetch path has fallbacks.
+                log(f"Feed poll returned HTTP {poll['status']}; running full fetch.")
+                process()
+        except Exception as exc:
+            log(f"Poll failed: {exc}")
+
+        hot = near_publish_time(datetime.now(timezone.utc), hot_minutes, window)
+        interval = next_interval(
+            interval, changed, hot, min_interval, max_interval, backoff, retry_after
+        )
+        log(f"Next poll in {interval:.0f}s.")
+
+
+def _watch_all(
+    pubs: List[Dict],
+    session: requests.Session,
+    clients: Dict[str, ElevenLabs],
+    limiter: FairLimiter,
+    profile: Optional[Path] = None,
+) -> None:
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(
+                _in_worker,
+                profile,
+                pub["name"],
+                watch_publication,
+                pub["settings"],
+                pub["name"],
+                session,
+                clients,
+                limiter,
+                stop,
+            ),
+            name=pub["name"],
+            daemon=True,
+        )
+        for pub in pubs
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+    except KeyboardInterrupt:
+        make_log()("Stopping watchers...")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    load_dotenv()
+
+    if args.trace:
+        start_tracing(Path(args.trace))
+    if args.events:
+        start_events()
+    try:
+        with span("batch.run"):
+            _run(args)
+    finally:
+        stop_tracing()
+        stop_events()
+
+
+def _run(args: argparse.Namespace) -> None:
+    log = make_log()
+    publications_file = args.publications or env("PUBLICATIONS_FILE")
+    limiter = FairLimiter(int(env("TTS_MAX_CONCURRENCY", "2")))
+    if args.watch and args.dry_run:
+        raise SystemExit("--watch and --dry-run cannot be combined")
+
+    profile = Path(args.profile) if args.profile else None
+
+    if not publications_file:
+        with profiled(profile):
+            if args.watch:
+                try:
+                    watch_publication(os.environ, session=make_session(), clients={}, limiter=limiter)
+                except KeyboardInterrupt:
+                    log("Stopping watcher...")
+                return
+            run_publication(os.environ, dry_run=args.dry_run, limiter=limiter)
+        log(f"Peak memory: {peak_rss_bytes() / (1024 * 1024):.1f} MB")
+        return
+
+    pubs = load_publications(publications_file)
+    if not pubs:
+        raise SystemExit(f"No publications listed in {publications_file}")
+
+    # One process for every show: shared connection pool, one ElevenLabs client
+    # per API key, and a global TTS limiter that rotates between publications.
+    session = make_session(pool_size=max(10, len(pubs) * 2))
+    clients: Dict[str, ElevenLabs] = {}
+    if not args.dry_run:
+        for pub in pubs:
+            key = env("ELEVENLABS_API_KEY", "", pub["settings"])
+            if key and key not in clients:
+                clients[key] = ElevenLabs(api_key=key)
+
+    if args.watch:
+        _watch_all(pubs, session, clients, limiter, profile)
+        return
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=len(pubs)) as pool:
+        # Each publication runs in a copy of this context so its spans nest
+        # under the batch.run span.
+        futures = {
+            pool.submit(
+                contextvars.copy_context().run,
+                _in_worker,
+                profile,
+                pub["name"],
+                run_publication,
+                pub["settings"],
+                dry_run=args.dry_run,
+                name=pub["name"],
+                session=session,
+                clients=clients,
+                limiter=limiter,
+            ): pub["name"]
+            for pub in pubs
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (Exception, SystemExit) as exc:
+                failures.append(futures[future])
+                make_log(futures[future])(f"failed: {exc}")
+
+    log(f"Publications processed: {len(pubs) - len(failures)}/{len(pubs)}")
+    log(f"Peak memory: {peak_rss_bytes() / (1024 * 1024):.1f} MB")
+    if failures:
+        raise SystemExit(f"Failed publication(s): {', '.join(sorted(failures))}")
 
 
 if __name__ == "__main__":
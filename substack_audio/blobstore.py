@@ -0,0 +1,133 @@
+"""Content-addressed audio store: each distinct MP3 is kept once, public names link to it."""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from substack_audio.integrity import episode_files
+from substack_audio.publish import file_sha256
+from substack_audio.trace import span
+from substack_audio.util import link_or_copy
+
+
+def blob_path(blob_dir: Path, sha256: str) -> Path:
+    return blob_dir / sha256[:2] / f"{sha256}.mp3"
+
+
+def _device(path: Path) -> int:
+    # st_dev of the nearest existing ancestor: the blob directory may not exist yet.
+    while not path.exists() and path.parent != path:
+        path = path.parent
+    return path.stat().st_dev
+
+
+def store_file(path: Path, blob_dir: Path, sha256: str = "") -> Dict:
+    """Put ``path``'s content in the store and make ``path`` a link to its blob.
+
+    A recorded ``sha256`` skips re-hashing when ``path`` already is that blob.
+    ``blob`` in the result is ``new``, ``existing`` (``path`` was a duplicate
+    and now shares the blob), ``linked`` (nothing to do) or ``skipped``
+    (``blob_dir`` is on another filesystem; only the hash is recorded).
+    """
+    if sha256:
+        blob = blob_path(blob_dir, sha256)
+        if blob.exists() and os.path.samefile(path, blob):
+            return {"sha256": sha256, "blob": "linked", "link": "hardlink", "bytes_saved": 0}
+
+    digest = file_sha256(path)
+    blob = blob_path(blob_dir, digest)
+    if blob.exists() and os.path.samefile(path, blob):
+        return {"sha256": digest, "blob": "linked", "link": "hardlink", "bytes_saved": 0}
+    if _device(blob.parent) != path.stat().st_dev:
+        # Neither a hard link nor a reflink can cross filesystems, and a blob
+        # copy would store the audio twice; keep the public file as it is.
+        return {"sha256": digest, "blob": "skipped", "link": "none", "bytes_saved": 0}
+    if not blob.exists():
+        return {"sha256": digest, "blob": "new", "link": link_or_copy(path, blob), "bytes_saved": 0}
+    size = path.stat().st_size
+    link = link_or_copy(blob, path)
+    return {
+        "sha256": digest,
+        "blob": "existing",
+        "link": link,
+        "bytes_saved": size if link != "copy" else 0,
+    }
+
+
+def store_audio(episodes: Iterable[Dict], audio_dir: Path, blob_dir: Path) -> Dict:
+    """Store every existing MP3 of ``episodes`` (renditions included) by content hash.
+
+    Records ``audio_sha256`` on each episode and rendition entry, the
+    references `blob_refcounts` counts.
+    """
+    counts = {"new": 0, "existing": 0, "linked": 0, "skipped": 0}
+    links: Dict[str, int] = {}
+    saved = 0
+    with span("blobs.store", blob_dir=str(blob_dir)) as sp:
+        for ep in episodes:
+            if not ep.get("audio_file"):
+                continue
+            for i, entry in enumerate(episode_files(ep)):
+                path = audio_dir / entry["audio_file"]
+                if not path.exists():
+                    continue
+                # The main file's hash lives on the episode itself.
+                owner = ep if i == 0 else entry
+                result = store_file(path, blob_dir, owner.get("audio_sha256", ""))
+                owner["audio_sha256"] = result["sha256"]
+                counts[result["blob"]] += 1
+                links[result["link"]] = links.get(result["link"], 0) + 1
+                saved += result["bytes_saved"]
+        sp.set("new", counts["new"])
+        sp.set("bytes_saved", saved)
+    return {"blobs": counts, "links": links, "bytes_saved": saved}
+
+
+def blob_refcounts(episodes: Iterable[Dict]) -> Dict[str, int]:
+    """How many episode files (main and renditions) in the episode store use each blob."""
+    refs: Dict[str, int] = {}
+    for ep in episodes:
+        if not ep.get("audio_file"):
+            continue
+        for i, entry in enumerate(episode_files(ep)):
+            digest = (ep if i == 0 else entry).get("audio_sha256")
+            if digest:
+                refs[digest] = refs.get(digest, 0) + 1
+    return refs
+
+
+def collect_blobs(episodes: List[Dict], blob_dir: Path, dry_run: bool = False) -> Dict:
+    """Delete blobs nothing uses; with ``dry_run`` only list them.
+
+    A blob is kept while this episode store refers to it or while it has
+    other hard links: public names, possibly of other project roots sharing
+    ``blob_dir``. Deleting an unlinked blob never loses audio, since a
+    public copy or reflink does not depend on it.
+    """
+    refs = blob_refcounts(episodes)
+    unused: List[Dict] = []
+    total = 0
+    for path in sorted(blob_dir.glob("*/*.mp3")) if blob_dir.exists() else []:
+        st = path.stat()
+        total += 1
+        if refs.get(path.stem, 0) == 0 and st.st_nlink == 1:
+            unused.append({"sha256": path.stem, "bytes": st.st_size})
+
+    removed: List[str] = []
+    if not dry_run:
+        for blob in unused:
+            path = blob_path(blob_dir, blob["sha256"])
+            try:
+                path.unlink()
+                removed.append(blob["sha256"])
+                if not any(path.parent.iterdir()):
+                    path.parent.rmdir()
+            except OSError:
+                pass
+    return {
+        "blobs_total": total,
+        "blobs_shared": sum(1 for n in refs.values() if n > 1),
+        "unused": unused,
+        "bytes_reclaimable": sum(b["bytes"] for b in unused),
+        "removed": removed,
+    }
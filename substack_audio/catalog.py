@@ -0,0 +1,245 @@
+"""Episode catalog: a local SQLite index over episodes.json for lookups and full-text search."""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from substack_audio.trace import span
+from substack_audio.util import load_json
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS episodes (
+    guid TEXT PRIMARY KEY,
+    pub_ts REAL NOT NULL,
+    data TEXT NOT NULL,
+    narrative TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS episodes_pub_ts ON episodes (pub_ts);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+    guid UNINDEXED, title, description, narrative
+);
+"""
+
+
+def index_path_for(episodes_file: Path) -> Path:
+    """``data/episodes.json`` -> ``data/episodes.index.sqlite``."""
+    return episodes_file.with_name(f"{episodes_file.stem}.index.sqlite")
+
+
+def parse_iso_date(value: str) -> datetime:
+    """Parse an ISO date or datetime; naive values are taken as UTC."""
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _pub_ts(episode: Dict) -> float:
+    try:
+        return parse_iso_date(episode.get("pub_date_iso") or "").timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _file_signature(path: Path) -> str:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return ""
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'episodes_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def open_catalog(episodes_file: Path, state_file: Optional[Path] = None) -> sqlite3.Connection:
+    """Open the index next to ``episodes_file``, refreshing it if the JSON changed.
+
+    The index is rebuilt from ``episodes_file`` only when that file's size or
+    mtime differ from the last sync, so repeated queries read just the rows
+    they need. Narrative text is kept across rebuilds, keyed by guid.
+    """
+    conn = sqlite3.connect(str(index_path_for(episodes_file)))
+    conn.executescript(_SCHEMA)
+    try:
+        conn.executescript(_FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass  # SQLite built without FTS5; search falls back to LIKE.
+
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    signature = _file_signature(episodes_file)
+    if meta.get("episodes_signature") != signature:
+        with span("catalog.sync", path=str(episodes_file)) as sp:
+            episodes = load_json(episodes_file, [])
+            _sync(conn, episodes)
+            sp.set("episodes", len(episodes))
+        _set_meta(conn, "episodes_signature", signature)
+
+    if state_file is not None:
+        state_signature = _file_signature(state_file)
+        if meta.get("state_signature") != state_signature:
+            state = load_json(state_file, {"processed_guids": []})
+            _set_meta(conn, "processed_guids_count", str(len(state.get("processed_guids", []))))
+            _set_meta(conn, "state_signature", state_signature)
+
+    conn.commit()
+    return conn
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _sync(conn: sqlite3.Connection, episodes: List[Dict]) -> None:
+    narratives = dict(conn.execute("SELECT guid, narrative FROM episodes WHERE narrative != ''"))
+    conn.execute("DELETE FROM episodes")
+    if _has_fts(conn):
+        conn.execute("DELETE FROM episodes_fts")
+    for ep in episodes:
+        if ep.get("guid"):
+            _upsert(conn, ep, narratives.get(ep["guid"], ""))
+
+
+def _upsert(conn: sqlite3.Connection, episode: Dict, narrative: str) -> None:
+    guid = episode["guid"]
+    conn.execute(
+        "INSERT OR REPLACE INTO episodes (guid, pub_ts, data, narrative) VALUES (?, ?, ?, ?)",
+        (guid, _pub_ts(episode), json.dumps(episode, ensure_ascii=False), narrative),
+    )
+    if _has_fts(conn):
+        conn.execute("DELETE FROM episodes_fts WHERE guid = ?", (guid,))
+        conn.execute(
+            "INSERT INTO episodes_fts (guid, title, description, narrative) VALUES (?, ?, ?, ?)",
+            (guid, episode.get("title", ""), episode.get("description", ""), narrative),
+        )
+
+
+def index_episode(
+    conn: sqlite3.Connection,
+    episode: Dict,
+    episodes_file: Path,
+    narrative: Optional[str] = None,
+) -> None:
+    """Add or replace one episode after ``episodes_file`` has been saved.
+
+    Passing ``narrative`` makes the episode's spoken text searchable; otherwise
+    any narrative indexed earlier for the guid is kept.
+    """
+    if narrative is None:
+        row = conn.execute(
+            "SELECT narrative FROM episodes WHERE guid = ?", (episode["guid"],)
+        ).fetchone()
+        narrative = row[0] if row else ""
+    _upsert(conn, episode, narrative)
+    _set_meta(conn, "episodes_signature", _file_signature(episodes_file))
+    conn.commit()
+
+
+def episode_exists(conn: sqlite3.Connection, guid: str) -> bool:
+    return conn.execute("SELECT 1 FROM episodes WHERE guid = ?", (guid,)).fetchone() is not None
+
+
+def episode_count(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+
+
+def processed_guids_count(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'processed_guids_count'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _project(episode: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    if not fields:
+        return episode
+    return {f: episode[f] for f in fields if f in episode}
+
+
+def fts_phrases(text: str) -> str:
+    """``text`` as FTS5 phrase tokens, one per word, so no character is syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def query_episodes(
+    conn: sqlite3.Connection,
+    guid: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Dict], int]:
+    """Return one page of matching episodes and the total number of matches.
+
+    Episodes come newest first, or by relevance when ``search`` is given.
+    ``since``/``until`` are inclusive ISO dates or datetimes. ``search`` uses
+    FTS5 query syntax over title, description and narrative text; input that
+    is not valid syntax (e.g. ``don't``) is searched as plain words instead.
+    """
+    where: List[str] = []
+    params: List = []
+    if guid:
+        where.append("e.guid = ?")
+        params.append(guid)
+    if since:
+        where.append("e.pub_ts >= ?")
+        params.append(parse_iso_date(since).timestamp())
+    if until:
+        bound = parse_iso_date(until)
+        if len(until.strip()) == 10:  # a bare date includes the whole day
+            bound = bound.replace(hour=23, minute=59, second=59, microsecond=999999)
+        where.append("e.pub_ts <= ?")
+        params.append(bound.timestamp())
+
+    source = "episodes e"
+    order = "e.pub_ts DESC, e.guid"
+    snippet = "NULL"
+    search = (search or "").strip()
+    fts_param = None
+    if search:
+        if _has_fts(conn):
+            source = "episodes_fts f JOIN episodes e ON e.guid = f.guid"
+            where.append("episodes_fts MATCH ?")
+            fts_param = len(params)
+            params.append(search)
+            order = "bm25(episodes_fts), e.pub_ts DESC"
+            snippet = "snippet(episodes_fts, -1, '[', ']', '...', 12)"
+        else:
+            where.append("(e.data LIKE ? OR e.narrative LIKE ?)")
+            params += [f"%{search}%", f"%{search}%"]
+
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+    def run(params: List) -> Tuple[int, List]:
+        total = conn.execute(f"SELECT COUNT(*) FROM {source}{clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT e.data, {snippet} FROM {source}{clause} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [limit if limit > 0 else -1, offset],
+        ).fetchall()
+        return total, rows
+
+    try:
+        total, rows = run(params)
+    except sqlite3.OperationalError:
+        if fts_param is None:
+            raise
+        params[fts_param] = fts_phrases(search)
+        total, rows = run(params)
+
+    episodes = []
+    for data, match in rows:
+        ep = _project(json.loads(data), fields)
+        if match:
+            ep["match"] = match
+        episodes.append(ep)
+    return episodes, total
@@ -6,18 +6,51 @@ All commands output JSON to stdout.
 """
 
 import argparse
+import contextvars
 import json
 import os
+import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
-from substack_audio.config import env
+from substack_audio.blobstore import collect_blobs, store_audio
+from substack_audio.catalog import (
+    episode_count,
+    episode_exists,
+    index_episode,
+    open_catalog,
+    processed_guids_count,
+    query_episodes,
+)
+from substack_audio.config import env, env_bool, feed_config, parse_csv
+from substack_audio.events import EVENT_FORMATS, emit, events_enabled, start_events, stop_events
 from substack_audio.feed import build_audio_url, build_feed
-from substack_audio.fetch import fetch_article_by_url
-from substack_audio.tts import concat_mp3, elevenlabs_tts, split_text
+from substack_audio.fetch import fetch_article
+from substack_audio.hls import HlsPlaylist
+from substack_audio.integrity import collect_garbage, hash_audio, verify_audio
+from substack_audio.postprocess import (
+    RENDITION_PRESETS,
+    output_format_bitrate,
+    check_renditions,
+    postprocess_many,
+    rendition_entry,
+)
+from substack_audio.publish import publish_tree
+from substack_audio.textfilter import filter_rules, filter_text
+from substack_audio.trace import profiled, span, start_tracing, stop_tracing, to_chrome_trace
+from substack_audio.tts import (
+    check_output_format,
+    chunk_cache_key,
+    concat_mp3,
+    split_text,
+    synthesize_chunk,
+)
 from substack_audio.util import load_json, parse_pub_date, save_json, slugify
 
 # Plugin directory = parent of substack_audio/ package.
@@ -53,7 +86,10 @@ def _config_file() -> Path:
 
 
 def _output(data: dict):
-    """Print JSON to stdout."""
+    """Print JSON to stdout (a final ``result``/``error`` event with --events ndjson)."""
+    if events_enabled():
+        emit("error" if "error" in data else "result", **data)
+        return
     print(json.dumps(data, indent=2, default=str))
 
 
@@ -141,10 +177,132 @@ def cmd_setup_check(args):
 
 
 def cmd_fetch_article(args):
-    result = fetch_article_by_url(args.url)
+    cache_dir = None
+    if not args.no_cache and env_bool("FEED_CACHE", True):
+        cache_dir = _project_root(args) / env("FEED_CACHE_DIR", "data/feed_cache")
+    result = fetch_article(args.url, cache_dir=cache_dir)
     _output(result)
 
 
+def _parse_variant(spec: str, voice_id: str, model_id: str, output_format: str) -> dict:
+    """``voice[:model[:format]]``; empty fields fall back to the .env defaults."""
+    parts = (spec.split(":") + ["", ""])[:3]
+    return {
+        "voice_id": parts[0].strip() or voice_id,
+        "model_id": parts[1].strip() or model_id,
+        "output_format": parts[2].strip() or output_format,
+    }
+
+
+def _read_narrative(args):
+    """Narrative text from --text-file after the text filter, plus the filter report."""
+    text = Path(args.text_file).read_text(encoding="utf-8").strip()
+    if not text:
+        _output({"error": f"Text file is empty: {args.text_file}"})
+        sys.exit(1)
+    text, filter_report = filter_text(text, None if args.no_filter else filter_rules())
+    if not text:
+        _output({"error": f"Nothing left to synthesize after filtering: {args.text_file}"})
+        sys.exit(1)
+    return text, filter_report
+
+
+def _episode_base_name(title: str, pub_date: str) -> str:
+    # Parse pub_date for filename prefix
+    if pub_date:
+        try:
+            dt = parse_pub_date(pub_date)
+        except Exception:
+            dt = datetime.now(timezone.utc)
+    else:
+        dt = datetime.now(timezone.utc)
+    return f"{dt.strftime('%Y-%m-%d')}-{slugify(title)}"
+
+
+def _preview_cache_dir(root: Path) -> Path:
+    return root / "output" / "preview" / "chunks"
+
+
+def _blob_dir(root: Path) -> Optional[Path]:
+    """The content-addressed audio store (AUDIO_BLOB_DIR), or None if AUDIO_BLOB_STORE is off."""
+    if not env_bool("AUDIO_BLOB_STORE", True):
+        return None
+    return root / env("AUDIO_BLOB_DIR", "output/blobs")
+
+
+def _synthesize_variants(
+    client,
+    chunks,
+    variants,
+    output_dir: Path,
+    max_concurrency: int,
+    playlists=None,
+    cache_dir: Optional[Path] = None,
+):
+    """Synthesize every chunk for every variant, at most ``max_concurrency`` at a time.
+
+    Requests are queued chunk by chunk across variants so all variants finish
+    together. Returns the part files of each variant, in chunk order, and the
+    ``cache_dir`` entries (from `preview_audio`) used instead of a request.
+    With ``playlists`` (one `HlsPlaylist` per variant), each variant's chunks
+    are appended to its playlist in order as soon as they are available.
+    """
+    parts = [[None] * len(chunks) for _ in variants]
+    reused: List[Path] = []
+    next_chunk = [0] * len(variants)
+    hls_lock = threading.Lock()
+
+    def stream(v_idx: int) -> None:
+        with hls_lock:
+            while next_chunk[v_idx] < len(chunks) and parts[v_idx][next_chunk[v_idx]]:
+                playlists[v_idx].add_chunk(parts[v_idx][next_chunk[v_idx]].read_bytes())
+                next_chunk[v_idx] += 1
+
+    def synthesize(v_idx: int, idx: int) -> None:
+        variant = variants[v_idx]
+        cached = None
+        if cache_dir is not None:
+            key = chunk_cache_key(
+                variant["voice_id"], variant["model_id"], variant["output_format"], chunks[idx]
+            )
+            cached = cache_dir / f"{key}.mp3"
+        if cached is not None and cached.exists():
+            audio_bytes = cached.read_bytes()
+            reused.append(cached)
+            emit("chunk_cached", index=idx + 1, total=len(chunks), variant=variant["stem"])
+        else:
+            audio_bytes = synthesize_chunk(
+                client=client,
+                voice_id=variant["voice_id"],
+                model_id=variant["model_id"],
+                output_format=variant["output_format"],
+                text=chunks[idx],
+                index=idx + 1,
+                total=len(chunks),
+                variant=variant["stem"],
+            )
+        part_path = output_dir / f"{variant['stem']}.part{idx + 1}.mp3"
+        part_path.write_bytes(audio_bytes)
+        parts[v_idx][idx] = part_path
+        if playlists:
+            stream(v_idx)
+
+    tasks = [(v_idx, idx) for idx in range(len(chunks)) for v_idx in range(len(variants))]
+    for v_idx, idx in tasks:
+        emit(
+            "chunk_queued",
+            index=idx + 1,
+            total=len(chunks),
+            chars=len(chunks[idx]),
+            variant=variants[v_idx]["stem"],
+        )
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(tasks)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, synthesize, *t) for t in tasks]
+        for future in futures:
+            future.result()
+    return parts, reused
+
+
 def cmd_generate_audio(args):
     from elevenlabs.client import ElevenLabs
 
@@ -163,69 +321,176 @@ def cmd_generate_audio(args):
     output_format = env("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
     text_limit = int(env("ELEVENLABS_TEXT_LIMIT", "4500"))
 
-    # Read narrative text from file
-    text = Path(args.text_file).read_text(encoding="utf-8").strip()
-    if not text:
-        _output({"error": f"Text file is empty: {args.text_file}"})
-        sys.exit(1)
+    text, filter_report = _read_narrative(args)
 
     root = _project_root(args)
     output_dir = root / "output" / "public" / "audio"
     output_dir.mkdir(parents=True, exist_ok=True)
+    base_name = _episode_base_name(args.title, args.pub_date)
 
-    # Parse pub_date for filename prefix
-    if args.pub_date:
+    # The first variant is the episode's main file; others get a suffix.
+    specs = args.variant or parse_csv(env("AUDIO_VARIANTS", "")) or [""]
+    variants = [_parse_variant(spec, voice_id, model_id, output_format) for spec in specs]
+    for n, variant in enumerate(variants):
         try:
-            dt = parse_pub_date(args.pub_date)
-        except Exception:
-            dt = datetime.now(timezone.utc)
-    else:
-        dt = datetime.now(timezone.utc)
+            check_output_format(variant["output_format"])
+        except ValueError as exc:
+            _output({"error": str(exc)})
+            sys.exit(1)
+        # The model is only named when it is not the default one.
+        model = variant["model_id"] if variant["model_id"] != model_id else ""
+        suffix = slugify(f"{variant['voice_id']} {model} {variant['output_format'].replace('_', ' ')}")
+        variant["stem"] = base_name if n == 0 else f"{base_name}.{suffix}"
+    if len({v["stem"] for v in variants}) != len(variants):
+        _output({"error": "Duplicate --variant (same voice, model and output format)"})
+        sys.exit(1)
 
-    date_prefix = dt.strftime("%Y-%m-%d")
-    slug = slugify(args.title)
-    base_name = f"{date_prefix}-{slug}"
+    normalize = env_bool("AUDIO_NORMALIZE", False)
+    renditions = parse_csv(env("AUDIO_RENDITIONS", ""))
+    try:
+        check_renditions(renditions)
+    except ValueError as exc:
+        _output({"error": str(exc)})
+        sys.exit(1)
 
     client = ElevenLabs(api_key=api_key)
     chunks = split_text(text, text_limit)
-    part_files = []
-
-    for idx, chunk in enumerate(chunks, start=1):
-        audio_bytes = elevenlabs_tts(
-            client=client,
-            voice_id=voice_id,
-            model_id=model_id,
-            output_format=output_format,
-            text=chunk,
+    max_concurrency = int(env("TTS_MAX_CONCURRENCY", "2"))
+    playlists = None
+    if args.hls or env_bool("AUDIO_HLS", False):
+        hls_root = root / "output" / "public" / "hls"
+        playlists = [HlsPlaylist(hls_root / v["stem"]) for v in variants]
+    part_lists, reused = _synthesize_variants(
+        client,
+        chunks,
+        variants,
+        output_dir,
+        max_concurrency,
+        playlists,
+        cache_dir=_preview_cache_dir(root),
+    )
+
+    results = []
+    for n, (variant, part_files) in enumerate(zip(variants, part_lists)):
+        final_audio = output_dir / f"{variant['stem']}.mp3"
+        concat_mp3(part_files, final_audio)
+
+        # Clean up part files
+        for part in part_files:
+            try:
+                part.unlink()
+            except OSError:
+                pass
+
+        processed = postprocess_many(
+            [final_audio],
+            normalize=normalize,
+            renditions=renditions,
+            target_lufs=float(env("AUDIO_LOUDNESS_TARGET", "-16")),
+            bitrate=output_format_bitrate(variant["output_format"]),
         )
-        part_path = output_dir / f"{base_name}.part{idx}.mp3"
-        part_path.write_bytes(audio_bytes)
-        part_files.append(part_path)
 
-    final_audio = output_dir / f"{base_name}.mp3"
-    concat_mp3(part_files, final_audio)
+        result = {
+            "voice_id": variant["voice_id"],
+            "model_id": variant["model_id"],
+            "output_format": variant["output_format"],
+            "audio_file": final_audio.name,
+            "audio_path": str(final_audio),
+            "audio_url": build_audio_url(public_base_url, final_audio.name),
+            "audio_size_bytes": final_audio.stat().st_size,
+        }
+        # Only renditions that were actually encoded (none without ffmpeg).
+        produced = {}
+        for name in renditions:
+            entry = rendition_entry(output_dir, final_audio.name, name, public_base_url)
+            if entry:
+                produced[name] = entry
+        result["renditions"] = produced
+        if processed and "error" in processed[0]:
+            result["postprocess_error"] = processed[0]["error"]
+        if playlists:
+            playlists[n].close()
+            result["hls_playlist"] = str(playlists[n].playlist)
+            result["hls_url"] = f"{public_base_url.rstrip('/')}/hls/{variant['stem']}/index.m3u8"
+        results.append(result)
 
-    # Clean up part files
-    for part in part_files:
+    for orphan in output_dir.glob("*.part*.mp3"):
         try:
-            part.unlink()
+            orphan.unlink()
         except OSError:
             pass
-    for orphan in output_dir.glob("*.part*.mp3"):
+    # A preview chunk is only reused once.
+    for cached in reused:
         try:
-            orphan.unlink()
+            cached.unlink()
         except OSError:
             pass
 
-    audio_url = build_audio_url(public_base_url, final_audio.name)
-    audio_size = final_audio.stat().st_size
+    primary = {k: v for k, v in results[0].items() if k not in ("voice_id", "model_id", "output_format")}
+    output = {
+        **primary,
+        "chunks_processed": len(chunks),
+        "chunks_reused": len(reused),
+        "filter": filter_report,
+    }
+    if len(results) > 1:
+        output["variants"] = results
+    _output(output)
+
+
+def cmd_preview_audio(args):
+    from elevenlabs.client import ElevenLabs
+
+    api_key = env("ELEVENLABS_API_KEY")
+    voice_id = env("ELEVENLABS_VOICE_ID")
+    if not api_key or not voice_id:
+        _output({"error": "Missing ELEVENLABS_API_KEY or ELEVENLABS_VOICE_ID. Run /setup first."})
+        sys.exit(1)
+
+    model_id = env("ELEVENLABS_MODEL_ID", "eleven_v3")
+    output_format = env("ELEVENLABS_OUTPUT_FORMAT", "mp3_44100_128")
+    text_limit = int(env("ELEVENLABS_TEXT_LIMIT", "4500"))
+    try:
+        check_output_format(output_format)
+    except ValueError as exc:
+        _output({"error": str(exc)})
+        sys.exit(1)
+
+    text, filter_report = _read_narrative(args)
+    # Same chunk plan as generate_audio, so its first chunk can be reused there.
+    chunks = split_text(text, text_limit)
+    key = chunk_cache_key(voice_id, model_id, output_format, chunks[0])
+
+    root = _project_root(args)
+    cache_dir = _preview_cache_dir(root)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached = cache_dir / f"{key}.mp3"
+    reused = cached.exists()
+    if not reused:
+        audio_bytes = synthesize_chunk(
+            client=ElevenLabs(api_key=api_key),
+            voice_id=voice_id,
+            model_id=model_id,
+            output_format=output_format,
+            text=chunks[0],
+            index=1,
+            total=len(chunks),
+        )
+        tmp = cached.with_name(f".{cached.name}.tmp")
+        tmp.write_bytes(audio_bytes)
+        os.replace(tmp, cached)
+
+    preview = cache_dir.parent / f"{_episode_base_name(args.title, args.pub_date)}.preview.mp3"
+    shutil.copyfile(cached, preview)
 
     _output({
-        "audio_file": final_audio.name,
-        "audio_path": str(final_audio),
-        "audio_url": audio_url,
-        "audio_size_bytes": audio_size,
-        "chunks_processed": len(chunks),
+        "preview_file": preview.name,
+        "preview_path": str(preview),
+        "preview_size_bytes": preview.stat().st_size,
+        "preview_chars": len(chunks[0]),
+        "chunks_planned": len(chunks),
+        "already_synthesized": reused,
+        "filter": filter_report,
     })
 
 
@@ -238,13 +503,14 @@ def cmd_update_feed(args):
     episodes_file.parent.mkdir(parents=True, exist_ok=True)
     output_feed.parent.mkdir(parents=True, exist_ok=True)
 
+    catalog = open_catalog(episodes_file)
     episodes = load_json(episodes_file, [])
     state = load_json(state_file, {"processed_guids": []})
     processed_guids = set(state.get("processed_guids", []))
 
     # Remove existing entry for this guid (allows re-generation)
     episodes = [ep for ep in episodes if ep.get("guid") != args.guid]
-    episodes.append({
+    episode = {
         "guid": args.guid,
         "title": args.title,
         "description": args.description,
@@ -254,34 +520,58 @@ def cmd_update_feed(args):
         "audio_file": args.audio_file,
         "audio_url": args.audio_url,
         "audio_size_bytes": args.audio_size_bytes,
-    })
+    }
+
+    # Record any post-processed renditions sitting next to the final MP3
+    public_base_url = env("PUBLIC_BASE_URL")
+    audio_dir = root / "output" / "public" / "audio"
+    renditions = {}
+    for name in RENDITION_PRESETS:
+        entry = rendition_entry(audio_dir, args.audio_file, name, public_base_url)
+        if entry:
+            renditions[name] = entry
+    if renditions:
+        episode["renditions"] = renditions
+    blob_dir = _blob_dir(root)
+    if blob_dir is not None:
+        stored = store_audio([episode], audio_dir, blob_dir)
+    else:
+        hash_audio([episode], audio_dir)
+    episodes.append(episode)
 
     processed_guids.add(args.guid)
 
     # Rebuild feed
-    public_base_url = env("PUBLIC_BASE_URL")
-    cfg = {
-        "title": env("PODCAST_TITLE", "Substack Audio"),
-        "description": env("PODCAST_DESCRIPTION", "Audio versions of Substack posts."),
-        "site_link": env("PODCAST_LINK", ""),
-        "author": env("PODCAST_AUTHOR", ""),
-        "email": env("PODCAST_EMAIL", ""),
-        "language": env("PODCAST_LANGUAGE", "en"),
-        "image_url": env("PODCAST_IMAGE_URL", ""),
-        "feed_url": f"{public_base_url.rstrip('/')}/feed.xml" if public_base_url else "",
-    }
-    build_feed(episodes, output_feed, cfg)
+    cfg = feed_config(public_base_url)
+    feed_changed = build_feed(episodes, output_feed, cfg)
 
     # Persist
     save_json(episodes_file, episodes)
     state["processed_guids"] = sorted(processed_guids)
     save_json(state_file, state)
 
-    _output({
+    narrative = None
+    if args.narrative_file:
+        narrative = Path(args.narrative_file).read_text(encoding="utf-8")
+    index_episode(catalog, episode, episodes_file, narrative=narrative)
+    catalog.close()
+    emit(
+        "feed_committed",
+        guid=args.guid,
+        feed_path=str(output_feed),
+        feed_changed=feed_changed,
+        episodes=len(episodes),
+    )
+
+    result = {
         "episodes_count": len(episodes),
         "feed_path": str(output_feed),
+        "feed_changed": feed_changed,
         "state_path": str(state_file),
-    })
+    }
+    if blob_dir is not None:
+        result["audio_store"] = stored
+    _output(result)
 
 
 def cmd_list_episodes(args):
@@ -289,14 +579,36 @@ def cmd_list_episodes(args):
     episodes_file = root / "data" / "episodes.json"
     state_file = root / "data" / "state.json"
 
-    episodes = load_json(episodes_file, [])
-    state = load_json(state_file, {"processed_guids": []})
-
-    _output({
+    catalog = open_catalog(episodes_file, state_file)
+    episodes, total = query_episodes(
+        catalog,
+        guid=args.guid,
+        since=args.since,
+        until=args.until,
+        search=args.search,
+        limit=args.limit,
+        offset=args.offset,
+        fields=parse_csv(args.fields),
+    )
+    result = {
         "episodes": episodes,
-        "episode_count": len(episodes),
-        "processed_guids_count": len(state.get("processed_guids", [])),
-    })
+        "total": total,
+        "offset": args.offset,
+        "episode_count": episode_count(catalog),
+        "processed_guids_count": processed_guids_count(catalog),
+    }
+    catalog.close()
+    if args.offset + len(episodes) < total:
+        result["next_offset"] = args.offset + len(episodes)
+    _output(result)
+
+
+def cmd_exists(args):
+    root = _project_root(args)
+    catalog = open_catalog(root / "data" / "episodes.json")
+    exists = episode_exists(catalog, args.guid)
+    catalog.close()
+    _output({"guid": args.guid, "exists": exists})
 
 
 def cmd_cleanup(args):
@@ -315,6 +627,73 @@ def cmd_cleanup(args):
     _output({"removed": removed, "removed_count": len(removed)})
 
 
+def cmd_verify(args):
+    root = _project_root(args)
+    episodes_file = root / "data" / "episodes.json"
+    audio_dir = root / "output" / "public" / "audio"
+
+    episodes = load_json(episodes_file, [])
+    recorded = 0
+    if args.record_hashes:
+        recorded = hash_audio(episodes, audio_dir)
+        if recorded:
+            save_json(episodes_file, episodes)
+
+    result = verify_audio(
+        episodes, audio_dir, hashes=args.hashes, frames=args.frames, workers=args.workers
+    )
+    if args.record_hashes:
+        result["hashes_recorded"] = recorded
+    _output(result)
+
+
+def cmd_gc(args):
+    root = _project_root(args)
+    episodes = load_json(root / "data" / "episodes.json", [])
+    result = collect_garbage(episodes, root / "output" / "public" / "audio", dry_run=args.dry_run)
+    # After the orphans: their public names may have been a blob's last links.
+    blob_dir = _blob_dir(root)
+    if blob_dir is not None:
+        result["blobs"] = collect_blobs(episodes, blob_dir, dry_run=args.dry_run)
+    _output(result)
+
+
+def cmd_store_audio(args):
+    root = _project_root(args)
+    blob_dir = _blob_dir(root)
+    if blob_dir is None:
+        _output({"error": "AUDIO_BLOB_STORE is off."})
+        sys.exit(1)
+    episodes_file = root / "data" / "episodes.json"
+    episodes = load_json(episodes_file, [])
+    result = store_audio(episodes, root / "output" / "public" / "audio", blob_dir)
+    save_json(episodes_file, episodes)
+    _output({"blob_dir": str(blob_dir), **result})
+
+
+def cmd_publish(args):
+    root = _project_root(args)
+    target = args.target or env("PUBLISH_TARGET_DIR")
+    if not target:
+        _output({"error": "Missing --target or PUBLISH_TARGET_DIR."})
+        sys.exit(1)
+
+    result = publish_tree(
+        source=root / "output" / "public",
+        target=Path(target),
+        manifest_file=root / "data" / "publish_manifest.json",
+        workers=args.workers,
+        dry_run=args.dry_run,
+        delete=args.delete,
+    )
+    _output(result)
+
+
+def cmd_trace_export(args):
+    events = to_chrome_trace(Path(args.input), Path(args.output))
+    _output({"output": args.output, "events": events})
+
+
 def cmd_get_config(args):
     cfg = load_json(_config_file(), {})
     _output(cfg)
@@ -334,26 +713,81 @@ def cmd_save_config(args):
 # --- Argument parser ---
 
 
+def _profile_path(args) -> Optional[Path]:
+    if args.profile is None:
+        return None
+    return Path(args.profile or f"{args.command}.prof")
+
+
 def build_parser() -> argparse.ArgumentParser:
+    # Options every command accepts, after the command name.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--trace", metavar="PATH", help="Append span traces (JSONL) to PATH")
+    common.add_argument(
+        "--events",
+        choices=EVENT_FORMATS,
+        help="Stream progress events to stdout (the result becomes the last event)",
+    )
+    common.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Dump cProfile stats to PATH (default: <command>.prof)",
+    )
+
     parser = argparse.ArgumentParser(prog="substack_audio.cli", description="Substack Audio CLI")
     sub = parser.add_subparsers(dest="command", required=True)
 
     # setup_check
-    sub.add_parser("setup_check", help="Check plugin configuration status")
+    sub.add_parser("setup_check", parents=[common], help="Check plugin configuration status")
 
     # fetch_article
-    p = sub.add_parser("fetch_article", help="Fetch a Substack article by URL")
+    p = sub.add_parser("fetch_article", parents=[common], help="Fetch a Substack article by URL")
     p.add_argument("url", help="Article URL")
+    p.add_argument("--project-root", help="Podcast repo path (where the feed cache lives)")
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always scrape the page, ignoring feed items cached by the batch pipeline",
+    )
 
     # generate_audio
-    p = sub.add_parser("generate_audio", help="Generate audio from narrative text file")
+    p = sub.add_parser("generate_audio", parents=[common], help="Generate audio from narrative text file")
     p.add_argument("--title", required=True, help="Episode title")
     p.add_argument("--pub-date", default="", help="Publication date (ISO format)")
     p.add_argument("--text-file", required=True, help="Path to narrative text file")
+    p.add_argument(
+        "--no-filter",
+        action="store_true",
+        help="Synthesize the text as is, without the TEXT_FILTER boilerplate rules",
+    )
+    p.add_argument(
+        "--hls",
+        action="store_true",
+        help="Also stream finished chunks to output/public/hls/<name>/index.m3u8 (default: AUDIO_HLS)",
+    )
+    p.add_argument(
+        "--variant",
+        action="append",
+        metavar="VOICE[:MODEL[:FORMAT]]",
+        help="Render this voice/model/format too; repeatable, first is the main file "
+        "(default: AUDIO_VARIANTS, else the .env voice)",
+    )
     p.add_argument("--project-root", help="Podcast repo path (where audio is saved)")
 
+    # preview_audio
+    p = sub.add_parser(
+        "preview_audio", parents=[common], help="Synthesize the narrative's first chunk for review"
+    )
+    p.add_argument("--title", required=True, help="Episode title")
+    p.add_argument("--pub-date", default="", help="Publication date (ISO format)")
+    p.add_argument("--text-file", required=True, help="Path to narrative text file")
+    p.add_argument("--no-filter", action="store_true", help="Skip the TEXT_FILTER rules")
+    p.add_argument("--project-root", help="Podcast repo path")
+
     # update_feed
-    p = sub.add_parser("update_feed", help="Add episode to feed and update state")
+    p = sub.add_parser("update_feed", parents=[common], help="Add episode to feed and update state")
     p.add_argument("--title", required=True)
     p.add_argument("--description", required=True)
     p.add_argument("--author", required=True)
@@ -363,21 +797,72 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--audio-file", required=True)
     p.add_argument("--audio-url", required=True)
     p.add_argument("--audio-size-bytes", required=True, type=int)
+    p.add_argument("--narrative-file", help="Narrative text to index for list_episodes --search")
     p.add_argument("--project-root", help="Podcast repo path")
 
     # list_episodes
-    p = sub.add_parser("list_episodes", help="List all episodes")
+    p = sub.add_parser("list_episodes", parents=[common], help="List, filter and search episodes")
+    p.add_argument("--guid", help="Only the episode with this guid")
+    p.add_argument("--since", help="Published on or after this ISO date/datetime")
+    p.add_argument("--until", help="Published on or before this ISO date/datetime")
+    p.add_argument("--search", help="Full-text query over titles, descriptions and narratives")
+    p.add_argument("--limit", type=int, default=50, help="Page size, newest first (0 = all)")
+    p.add_argument("--offset", type=int, default=0, help="Episodes to skip")
+    p.add_argument("--fields", default="", help="Comma-separated episode fields to return")
+    p.add_argument("--project-root", help="Podcast repo path")
+
+    # exists
+    p = sub.add_parser("exists", parents=[common], help="Check whether an episode guid is already tracked")
+    p.add_argument("--guid", required=True, help="Episode guid (article URL)")
     p.add_argument("--project-root", help="Podcast repo path")
 
     # cleanup
-    p = sub.add_parser("cleanup", help="Remove orphaned .part*.mp3 files")
+    p = sub.add_parser("cleanup", parents=[common], help="Remove orphaned .part*.mp3 files")
     p.add_argument("--project-root", help="Podcast repo path")
 
+    # verify
+    p = sub.add_parser("verify", parents=[common], help="Cross-check episodes.json against the audio directory")
+    p.add_argument("--hashes", action="store_true", help="Compare each MP3's sha256 with audio_sha256")
+    p.add_argument("--frames", action="store_true", help="Walk every MP3 frame to catch truncation/corruption")
+    p.add_argument(
+        "--record-hashes",
+        action="store_true",
+        help="First store audio_sha256 for episodes that lack it",
+    )
+    p.add_argument("--workers", type=int, default=8, help="Parallel file checks")
+    p.add_argument("--project-root", help="Podcast repo path")
+
+    # gc
+    p = sub.add_parser("gc", parents=[common], help="Remove MP3s no episode refers to")
+    p.add_argument("--dry-run", action="store_true", help="List orphans without deleting")
+    p.add_argument("--project-root", help="Podcast repo path")
+
+    # store_audio
+    p = sub.add_parser(
+        "store_audio",
+        parents=[common],
+        help="Move every episode's audio into the blob store, linking duplicates",
+    )
+    p.add_argument("--project-root", help="Podcast repo path")
+
+    # publish
+    p = sub.add_parser("publish", parents=[common], help="Copy new or changed output/public files to a target dir")
+    p.add_argument("--target", help="Target directory or mounted mirror (default: PUBLISH_TARGET_DIR)")
+    p.add_argument("--workers", type=int, default=8, help="Parallel copy/hash workers")
+    p.add_argument("--dry-run", action="store_true", help="Report the delta without copying")
+    p.add_argument("--delete", action="store_true", help="Also remove files no longer in output/public")
+    p.add_argument("--project-root", help="Podcast repo path")
+
+    # trace_export
+    p = sub.add_parser("trace_export", parents=[common], help="Convert a JSONL trace to Chrome trace-event JSON")
+    p.add_argument("--input", required=True, help="JSONL trace written with --trace")
+    p.add_argument("--output", required=True, help="Chrome trace JSON to write")
+
     # get_config
-    sub.add_parser("get_config", help="Read persistent plugin config")
+    sub.add_parser("get_config", parents=[common], help="Read persistent plugin config")
 
     # save_config
-    p = sub.add_parser("save_config", help="Save persistent plugin config")
+    p = sub.add_parser("save_config", parents=[common], help="Save persistent plugin config")
     p.add_argument("--podcast-repo-path", help="Path to user's podcast repo")
     p.add_argument("--github-username", help="GitHub username")
 
@@ -392,18 +877,33 @@ def main():
         "setup_check": cmd_setup_check,
         "fetch_article": cmd_fetch_article,
         "generate_audio": cmd_generate_audio,
+        "preview_audio": cmd_preview_audio,
         "update_feed": cmd_update_feed,
         "list_episodes": cmd_list_episodes,
+        "exists": cmd_exists,
         "cleanup": cmd_cleanup,
+        "verify": cmd_verify,
+        "gc": cmd_gc,
+        "store_audio": cmd_store_audio,
+        "publish": cmd_publish,
+        "trace_export": cmd_trace_export,
         "get_config": cmd_get_config,
         "save_config": cmd_save_config,
     }
 
+    if args.trace:
+        start_tracing(Path(args.trace))
+    if args.events:
+        start_events()
     try:
-        commands[args.command](args)
+        with profiled(_profile_path(args)), span(f"cli.{args.command}"):
+            commands[args.command](args)
     except Exception as e:
         _output({"error": str(e)})
         sys.exit(1)
+    finally:
+        stop_tracing()
+        stop_events()
 
 
 if __name__ == "__main__":
@@ -1,21 +1,64 @@
 """Environment-based configuration helpers."""
 
+import json
 import os
-from typing import List
+from typing import Dict, List, Mapping, Optional
 
 
-def env(name: str, default: str = "") -> str:
-    value = os.getenv(name, default)
+def env(name: str, default: str = "", environ: Optional[Mapping[str, str]] = None) -> str:
+    """Read a setting from ``environ`` (default: the process environment)."""
+    source = os.environ if environ is None else environ
+    value = source.get(name, default)
     if value is None or value == "":
         return default
     return value
 
 
-def env_bool(name: str, default: bool = False) -> bool:
+def env_bool(name: str, default: bool = False, environ: Optional[Mapping[str, str]] = None) -> bool:
     raw_default = "true" if default else "false"
-    value = env(name, raw_default).strip().lower()
+    value = env(name, raw_default, environ).strip().lower()
     return value in {"1", "true", "yes", "on"}
 
 
 def parse_csv(value: str) -> List[str]:
     return [x.strip() for x in value.split(",") if x.strip()]
+
+
+def feed_config(public_base_url: str, environ: Optional[Mapping[str, str]] = None) -> Dict:
+    """Podcast feed settings for `build_feed`, read from the environment."""
+    return {
+        "title": env("PODCAST_TITLE", "Substack Audio", environ),
+        "description": env("PODCAST_DESCRIPTION", "Audio versions of Substack posts.", environ),
+        "site_link": env("PODCAST_LINK", "", environ),
+        "author": env("PODCAST_AUTHOR", "", environ),
+        "email": env("PODCAST_EMAIL", "", environ),
+        "language": env("PODCAST_LANGUAGE", "en", environ),
+        "image_url": env("PODCAST_IMAGE_URL", "", environ),
+        "feed_url": f"{public_base_url.rstrip('/')}/feed.xml" if public_base_url else "",
+        "rendition": env("FEED_AUDIO_RENDITION", "", environ),
+        "max_items": int(env("FEED_MAX_ITEMS", "0", environ)),
+        "archive_page_size": int(env("FEED_ARCHIVE_PAGE_SIZE", "0", environ)),
+    }
+
+
+def load_publications(path: str, base: Optional[Mapping[str, str]] = None) -> List[Dict]:
+    """Read a multi-publication file into ``[{"name", "settings"}]``.
+
+    The file is JSON: ``{"defaults": {...}, "publications": [{"name": ..., "env": {...}}]}``.
+    Each publication's settings are ``base`` (the process environment by
+    default) overlaid with ``defaults`` and then its own ``env``, using the
+    same keys as ``.env``.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    base = dict(os.environ if base is None else base)
+    defaults = {k: str(v) for k, v in (data.get("defaults") or {}).items()}
+
+    pubs = []
+    for idx, pub in enumerate(data.get("publications") or [], start=1):
+        own = {k: str(v) for k, v in (pub.get("env") or {}).items()}
+        pubs.append({
+            "name": pub.get("name") or f"publication-{idx}",
+            "settings": {**base, **defaults, **own},
+        })
+    return pubs
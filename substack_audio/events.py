@@ -0,0 +1,37 @@
+"""Progress events: one JSON object per line on stdout, for orchestrators."""
+
+import json
+import sys
+import threading
+import time
+from typing import IO, Optional
+
+_lock = threading.Lock()
+_stream: Optional[IO[str]] = None
+
+EVENT_FORMATS = ("ndjson",)
+
+
+def start_events(stream: IO[str] = sys.stdout) -> None:
+    global _stream
+    _stream = stream
+
+
+def stop_events() -> None:
+    global _stream
+    _stream = None
+
+
+def events_enabled() -> bool:
+    return _stream is not None
+
+
+def emit(event: str, **fields) -> None:
+    """Write ``{"event": ..., "ts": ..., **fields}`` as one line; a no-op unless enabled."""
+    if _stream is None:
+        return
+    line = json.dumps({"event": event, "ts": round(time.time(), 3), **fields}, default=str)
+    with _lock:
+        if _stream is not None:
+            _stream.write(line + "\n")
+            _stream.flush()
@@ -0,0 +1,86 @@
+"""Extraction: turn feed items' HTML into excerpts and TTS chunk plans, optionally in parallel."""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from substack_audio.parse import strip_html_to_text
+from substack_audio.textfilter import Rules, filter_text
+from substack_audio.trace import span
+from substack_audio.tts import split_text
+
+
+def prepare_item(item: Dict, text_limit: int, rules: Optional[Rules] = None) -> Dict:
+    """Replace an item's HTML with its episode excerpt and TTS chunks.
+
+    The text goes through the ``rules`` text filter before chunking, and the
+    filter report is kept under ``filter``. An item with no text gets an empty
+    ``chunks`` list. Already-prepared items are returned unchanged.
+    """
+    if "chunks" in item:
+        return item
+
+    with span("extract", guid=item["guid"], html_bytes=len(item["content_html"] or "")) as sp:
+        text = strip_html_to_text(item["content_html"])
+        excerpt = strip_html_to_text(item["description_html"]).strip()
+        text, report = filter_text(text, rules)
+        sp.set("chars", len(text))
+        sp.set("chars_filtered", report["chars_removed"])
+    if not excerpt:
+        excerpt = text[:250] + ("..." if len(text) > 250 else "")
+
+    prepared = {k: v for k, v in item.items() if k not in ("content_html", "description_html")}
+    prepared["excerpt"] = excerpt
+    prepared["chunks"] = split_text(text, text_limit) if text else []
+    prepared["filter"] = report
+    return prepared
+
+
+def _prepare_batch(items: List[Dict], text_limit: int, rules: Optional[Rules]) -> List[Dict]:
+    return [prepare_item(it, text_limit, rules) for it in items]
+
+
+def iter_prepared(
+    items: Iterable[Dict],
+    text_limit: int,
+    workers: int = 0,
+    batch_size: int = 8,
+    rules: Optional[Rules] = None,
+) -> Iterator[Dict]:
+    """Yield prepared items in input order.
+
+    With ``workers`` > 1, HTML is parsed in a process pool. Items travel in
+    batches of ``batch_size`` to keep pickling overhead per post low, and
+    ``items`` is read only ``2 * workers`` batches ahead of what was yielded.
+    """
+    if workers <= 1:
+        for item in items:
+            yield prepare_item(item, text_limit, rules)
+        return
+
+    batches = _batched(items, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque([pool.submit(_prepare_batch, first, text_limit, rules)])
+        del first
+        for batch in batches:
+            pending.append(pool.submit(_prepare_batch, batch, text_limit, rules))
+            del batch
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _batched(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,19 +1,71 @@
-"""Podcast RSS feed generation."""
+"""Podcast RSS feed generation, with optional RFC 5005 archive pages."""
 
+import hashlib
+import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from feedgen.ext.base import BaseEntryExtension, BaseExtension
 from feedgen.feed import FeedGenerator
+from feedgen.util import xml_elem
 
-from substack_audio.util import ensure_parent
+from substack_audio.static import forget_static, write_static, write_static_json
+from substack_audio.trace import span
+from substack_audio.util import load_json
+
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+_FH_NS = "http://purl.org/syndication/history/1.0"
+
+ARCHIVE_DIR = "archive"
+_ARCHIVE_INDEX = "pages.json"
+
+
+class FeedHistoryExtension(BaseExtension):
+    """RFC 5005 paging links (``atom:link``) and the ``fh:archive`` marker for RSS."""
+
+    def __init__(self):
+        self._links: List[Dict] = []
+        self._archive = False
+
+    def link(self, href: str, rel: str) -> None:
+        self._links.append({"href": href, "rel": rel})
+
+    def archive(self, value: bool = True) -> None:
+        self._archive = value
+
+    def extend_ns(self):
+        return {"atom": _ATOM_NS, "fh": _FH_NS}
+
+    def extend_rss(self, rss_feed):
+        channel = rss_feed[0]
+        if self._archive:
+            xml_elem(f"{{{_FH_NS}}}archive", channel)
+        for ln in self._links:
+            xml_elem(f"{{{_ATOM_NS}}}link", channel, href=ln["href"], rel=ln["rel"])
+        return rss_feed
 
 
 def build_audio_url(public_base_url: str, file_name: str) -> str:
     return f"{public_base_url.rstrip('/')}/audio/{file_name}"
 
 
-def build_feed(episodes: List[Dict], output_feed: Path, cfg: Dict) -> None:
+def archive_page_url(feed_url: str, page: int) -> str:
+    base = feed_url.rsplit("/", 1)[0] if "/" in feed_url else ""
+    name = f"{ARCHIVE_DIR}/feed-{page}.xml"
+    return f"{base}/{name}" if base else name
+
+
+def enclosure_for(ep: Dict, rendition: str = "") -> Dict:
+    """Pick the enclosure audio for an episode, preferring the named rendition."""
+    if rendition:
+        chosen = (ep.get("renditions") or {}).get(rendition)
+        if chosen:
+            return chosen
+    return ep
+
+
+def _new_feed(cfg: Dict) -> FeedGenerator:
     fg = FeedGenerator()
     fg.load_extension("podcast")
 
@@ -34,19 +86,19 @@ def build_feed(episodes: List[Dict], output_feed: Path, cfg: Dict) -> None:
         fg.image(cfg["image_url"])
         fg.podcast.itunes_image(cfg["image_url"])
 
-    sorted_eps = sorted(
-        episodes,
-        key=lambda e: e.get("pub_date_iso", ""),
-        reverse=True,
-    )
+    return fg
 
-    for ep in sorted_eps:
+
+def _add_entries(fg: FeedGenerator, episodes: List[Dict], cfg: Dict) -> None:
+    """Add episodes (already sorted newest first) to the feed."""
+    for ep in episodes:
         fe = fg.add_entry()
         fe.id(ep["guid"])
         fe.title(ep["title"])
         fe.link(href=ep["link"]) if ep.get("link") else None
         fe.description(ep["description"])
-        fe.enclosure(ep["audio_url"], str(ep["audio_size_bytes"]), "audio/mpeg")
+        audio = enclosure_for(ep, cfg.get("rendition", ""))
+        fe.enclosure(audio["audio_url"], str(audio["audio_size_bytes"]), "audio/mpeg")
 
         pub_dt = datetime.fromisoformat(ep["pub_date_iso"])
         fe.pubDate(pub_dt)
@@ -55,5 +107,93 @@ def build_feed(episodes: List[Dict], output_feed: Path, cfg: Dict) -> None:
         fe.podcast.itunes_summary(ep["description"])
         fe.podcast.itunes_explicit("no")
 
-    ensure_parent(output_feed)
-    fg.rss_file(str(output_feed), pretty=True)
+
+def _write_archive_pages(archived: List[Dict], output_feed: Path, cfg: Dict) -> int:
+    """Write oldest-first archive pages, skipping pages whose inputs are unchanged.
+
+    Page 1 holds the oldest episodes; only the newest page is ever partial, so an
+    episode rolling off the main feed touches at most the last two pages.
+    Returns the number of archive pages.
+    """
+    page_size = int(cfg.get("archive_page_size") or cfg["max_items"])
+    pages = [archived[i:i + page_size] for i in range(0, len(archived), page_size)]
+    archive_dir = output_feed.parent / ARCHIVE_DIR
+    index_file = archive_dir / _ARCHIVE_INDEX
+    index = load_json(index_file, {})
+    dirty = False
+    feed_url = cfg["feed_url"]
+
+    for num, page_eps in enumerate(pages, start=1):
+        links = {"current": feed_url, "self": archive_page_url(feed_url, num)}
+        if num > 1:
+            links["prev-archive"] = archive_page_url(feed_url, num - 1)
+        if num < len(pages):
+            links["next-archive"] = archive_page_url(feed_url, num + 1)
+
+        page_file = archive_dir / f"feed-{num}.xml"
+        digest = hashlib.sha256(
+            json.dumps([cfg, links, page_eps], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        if index.get(page_file.name) == digest and page_file.exists():
+            continue
+
+        fg = _new_feed({**cfg, "feed_url": links["self"]})
+        fg.register_extension("history", FeedHistoryExtension, BaseEntryExtension)
+        fg.history.archive()
+        for rel in ("current", "prev-archive", "next-archive"):
+            if rel in links:
+                fg.history.link(links[rel], rel)
+        newest_first = list(reversed(page_eps))
+        fg.lastBuildDate(datetime.fromisoformat(newest_first[0]["pub_date_iso"]))
+        _add_entries(fg, newest_first, cfg)
+
+        write_static(page_file, fg.rss_str(pretty=True), output_feed.parent)
+        index[page_file.name] = digest
+        dirty = True
+
+    # Drop pages left over from a larger archive (e.g. after raising max_items).
+    for stale in archive_dir.glob("feed-*.xml") if archive_dir.exists() else []:
+        num = stale.stem.rsplit("-", 1)[-1]
+        if num.isdigit() and int(num) > len(pages):
+            forget_static(stale, output_feed.parent)
+            index.pop(stale.name, None)
+            dirty = True
+
+    if dirty:
+        write_static_json(index_file, index, output_feed.parent)
+    return len(pages)
+
+
+def build_feed(episodes: List[Dict], output_feed: Path, cfg: Dict) -> bool:
+    """Render the podcast feed; returns False when feed.xml was already up to date."""
+    with span("feed.build", episodes=len(episodes)) as sp:
+        changed = _build_feed(episodes, output_feed, cfg)
+        sp.set("changed", changed)
+        return changed
+
+
+def _build_feed(episodes: List[Dict], output_feed: Path, cfg: Dict) -> bool:
+    sorted_eps = sorted(
+        episodes,
+        key=lambda e: e.get("pub_date_iso", ""),
+        reverse=True,
+    )
+
+    fg = _new_feed(cfg)
+
+    max_items: Optional[int] = cfg.get("max_items") or None
+    if max_items and len(sorted_eps) > max_items:
+        archived = list(reversed(sorted_eps[max_items:]))
+        sorted_eps = sorted_eps[:max_items]
+        page_count = _write_archive_pages(archived, output_feed, cfg)
+        fg.register_extension("history", FeedHistoryExtension, BaseEntryExtension)
+        fg.history.link(archive_page_url(cfg["feed_url"], page_count), "prev-archive")
+    elif max_items:
+        _write_archive_pages([], output_feed, cfg)
+
+    _add_entries(fg, sorted_eps, cfg)
+    # Derive lastBuildDate from content so an unchanged feed renders identical bytes.
+    if sorted_eps:
+        fg.lastBuildDate(datetime.fromisoformat(sorted_eps[0]["pub_date_iso"]))
+
+    return write_static(output_feed, fg.rss_str(pretty=True), output_feed.parent)
@@ -0,0 +1,94 @@
+"""Feed cache: the last fetched RSS/API payload per feed, so articles resolve without a page scrape."""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from substack_audio.parse import iter_posts_json, iter_rss
+from substack_audio.trace import span
+
+# Cached file suffix by payload source; posts and archive payloads parse alike.
+FEED_SOURCES = {"rss": ".rss.xml", "posts_api": ".posts.json", "archive_api": ".archive.json"}
+
+
+def normalize_url(url: str) -> str:
+    """``https://host/path`` without query, fragment or trailing slash, for lookups.
+
+    Shared links carry ``utm_*`` parameters and may use http or a mixed-case
+    host; none of that identifies a different post.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip()
+    return f"https://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+def _host(url: str) -> str:
+    return urlsplit(url.strip()).netloc.lower() or "feed"
+
+
+def cache_feed(cache_dir: Path, feed_url: str, body: str, source: str) -> Path:
+    """Store ``body`` as the latest payload of ``feed_url``; replaces its previous copy."""
+    digest = hashlib.sha1(feed_url.encode("utf-8")).hexdigest()[:12]
+    stem = f"{_host(feed_url)}-{digest}"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for old in cache_dir.glob(f"{stem}.*"):
+        if not old.name.endswith(FEED_SOURCES[source]):
+            old.unlink()
+    path = cache_dir / f"{stem}{FEED_SOURCES[source]}"
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(body, encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def _source_of(path: Path) -> Optional[str]:
+    for source, suffix in FEED_SOURCES.items():
+        if path.name.endswith(suffix):
+            return source
+    return None
+
+
+@lru_cache(maxsize=16)
+def _index(path: str, mtime_ns: int) -> Dict[str, Dict]:
+    # Keyed by normalized link and by guid; mtime_ns invalidates on rewrite.
+    body = Path(path).read_text(encoding="utf-8")
+    items = iter_rss(body) if path.endswith(FEED_SOURCES["rss"]) else iter_posts_json(body)
+    index: Dict[str, Dict] = {}
+    for item in items:
+        if item["link"]:
+            index.setdefault(normalize_url(item["link"]), item)
+        index.setdefault(item["guid"], item)
+        index.setdefault(normalize_url(item["guid"]), item)
+    return index
+
+
+def _candidates(cache_dir: Path, host: str) -> List[Path]:
+    # The article's own publication first (custom domains serve their own feed), newest first.
+    paths = [p for p in cache_dir.glob("*") if not p.name.startswith(".") and _source_of(p)]
+    paths.sort(key=lambda p: (not p.name.startswith(f"{host}-"), -p.stat().st_mtime_ns))
+    return paths
+
+
+def find_cached_item(cache_dir: Path, url: str) -> Optional[Tuple[Dict, str]]:
+    """The cached feed item whose link or guid is ``url``, with its source; None on a miss.
+
+    Only items with a real body (RSS ``content:encoded`` or API ``body_html``)
+    are a hit. Archive payloads usually carry just a ``truncated_body_text``
+    snippet, and for those the page is scraped instead.
+    """
+    if not cache_dir.is_dir():
+        return None
+    keys = (normalize_url(url), url.strip())
+    with span("feedcache.lookup", url=url) as sp:
+        for path in _candidates(cache_dir, _host(url)):
+            index = _index(str(path), path.stat().st_mtime_ns)
+            item = next((index[k] for k in keys if k in index), None)
+            if item and item.get("has_body"):
+                sp.set("hit", path.name)
+                return item, _source_of(path)
+        sp.set("hit", None)
+    return None
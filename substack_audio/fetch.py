@@ -2,17 +2,22 @@
 
 import subprocess
 import time
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 try:
     import cloudscraper  # type: ignore
 except Exception:  # pragma: no cover
     cloudscraper = None
 
+from substack_audio.events import emit
+from substack_audio.feedcache import find_cached_item
 from substack_audio.parse import strip_html_to_text
+from substack_audio.trace import span
 
 _BROWSER_HEADERS = {
     "User-Agent": (
@@ -26,14 +31,35 @@ _BROWSER_HEADERS = {
 }
 
 
-def fetch_feed_xml(feed_url: str, timeout: int = 30) -> str:
+def make_session(pool_size: int = 10) -> requests.Session:
+    """A Session with a connection pool sized for concurrent use across feeds."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_feed_xml(
+    feed_url: str, timeout: int = 30, session: Optional[requests.Session] = None
+) -> str:
+    with span("http.fetch", url=feed_url) as sp:
+        body, via = _fetch_with_fallbacks(feed_url, timeout, session)
+        sp.set("via", via)
+        sp.set("bytes", len(body))
+        return body
+
+
+def _fetch_with_fallbacks(
+    feed_url: str, timeout: int, session: Optional[requests.Session]
+) -> Tuple[str, str]:
     headers = {
         **_BROWSER_HEADERS,
         "Accept": "application/rss+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1",
         "Referer": feed_url.rsplit("/", 1)[0],
     }
 
-    session = requests.Session()
+    session = session or requests.Session()
     last_exc = None
 
     # CI-friendly first try: curl often passes Cloudflare checks where requests fails.
@@ -55,7 +81,7 @@ def fetch_feed_xml(feed_url: str, timeout: int = 30) -> str:
         ]
         curl_resp = subprocess.run(curl_cmd, check=True, capture_output=True, text=True)
         if curl_resp.stdout.strip():
-            return curl_resp.stdout
+            return curl_resp.stdout, "curl"
     except Exception as exc:
         last_exc = exc
 
@@ -63,17 +89,19 @@ def fetch_feed_xml(feed_url: str, timeout: int = 30) -> str:
         try:
             resp = session.get(feed_url, headers=headers, timeout=timeout)
             resp.raise_for_status()
-            return resp.text
+            return resp.text, "requests"
         except requests.HTTPError as exc:
             last_exc = exc
             code = exc.response.status_code if exc.response is not None else None
             if code in (403, 429, 500, 502, 503, 504) and attempt < 3:
+                emit("retry", url=feed_url, attempt=attempt, status=code)
                 time.sleep(attempt * 2)
                 continue
             break
         except requests.RequestException as exc:
             last_exc = exc
             if attempt < 3:
+                emit("retry", url=feed_url, attempt=attempt, error=str(exc))
                 time.sleep(attempt * 2)
                 continue
             break
@@ -85,21 +113,84 @@ def fetch_feed_xml(feed_url: str, timeout: int = 30) -> str:
         )
         resp = scraper.get(feed_url, headers=headers, timeout=timeout)
         resp.raise_for_status()
-        return resp.text
+        return resp.text, "cloudscraper"
 
     raise RuntimeError(f"Failed to fetch feed: {feed_url}") from last_exc
 
 
-def fetch_archive_json(feed_url: str, timeout: int = 30) -> str:
+def poll_feed(
+    feed_url: str,
+    validators: Optional[Dict[str, str]] = None,
+    timeout: int = 30,
+    session: Optional[requests.Session] = None,
+) -> Dict:
+    """One conditional GET of the feed, for frequent polling.
+
+    ``validators`` holds the ETag / Last-Modified of the previous response.
+    Unlike `fetch_feed_xml` this never retries or falls back: the result has
+    the HTTP ``status``, the ``body`` (None unless 200), the new
+    ``validators`` and the Retry-After header, if any.
+    """
+    validators = validators or {}
+    headers = {
+        **_BROWSER_HEADERS,
+        "Accept": "application/rss+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1",
+    }
+    # Conditional requests must not carry no-cache directives.
+    headers.pop("Cache-Control")
+    headers.pop("Pragma")
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    session = session or requests.Session()
+    with span("http.poll", url=feed_url) as sp:
+        resp = session.get(feed_url, headers=headers, timeout=timeout)
+        sp.set("status", resp.status_code)
+        sp.set("bytes", len(resp.content))
+
+    result = {
+        "status": resp.status_code,
+        "body": resp.text if resp.status_code == 200 else None,
+        "validators": validators,
+        "retry_after": resp.headers.get("Retry-After"),
+    }
+    if resp.status_code == 200:
+        result["validators"] = {
+            "etag": resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+        }
+    return result
+
+
+def fetch_archive_json(
+    feed_url: str, timeout: int = 30, session: Optional[requests.Session] = None
+) -> str:
     base = feed_url.rsplit("/feed", 1)[0] if "/feed" in feed_url else feed_url.rstrip("/")
     archive_url = f"{base}/api/v1/archive?sort=new"
-    return fetch_feed_xml(archive_url, timeout=timeout)
+    return fetch_feed_xml(archive_url, timeout=timeout, session=session)
 
 
-def fetch_posts_json(feed_url: str, max_posts: int, timeout: int = 30) -> str:
+def fetch_posts_json(
+    feed_url: str, max_posts: int, timeout: int = 30, session: Optional[requests.Session] = None
+) -> str:
     base = feed_url.rsplit("/feed", 1)[0] if "/feed" in feed_url else feed_url.rstrip("/")
     posts_url = f"{base}/api/v1/posts?limit={max(10, max_posts * 3)}"
-    return fetch_feed_xml(posts_url, timeout=timeout)
+    return fetch_feed_xml(posts_url, timeout=timeout, session=session)
+
+
+def fetch_article(url: str, cache_dir: Optional[Path] = None, timeout: int = 30) -> Dict:
+    """An article by URL, from the feed cache when it holds the post, else scraped.
+
+    ``source`` in the result says which: ``rss``, ``posts_api``,
+    ``archive_api`` (see `cache_feed`) or ``page``.
+    """
+    hit = find_cached_item(cache_dir, url) if cache_dir is not None else None
+    if hit is None:
+        return {**fetch_article_by_url(url, timeout=timeout), "source": "page"}
+    item, source = hit
+    return {**_article_from_item(item, url), "source": source}
 
 
 def fetch_article_by_url(url: str, timeout: int = 30) -> Dict:
@@ -110,10 +201,31 @@ def fetch_article_by_url(url: str, timeout: int = 30) -> Dict:
         "Referer": url.rsplit("/", 1)[0],
     }
 
-    resp = requests.get(url, headers=headers, timeout=timeout)
-    resp.raise_for_status()
+    with span("http.fetch", url=url) as sp:
+        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        sp.set("bytes", len(resp.content))
+
+    with span("parse.article", bytes=len(resp.content)):
+        return _parse_article_html(resp.text, url)
+
+
+def _article_from_item(item: Dict, url: str) -> Dict:
+    content_text = strip_html_to_text(item["content_html"])
+    return {
+        "title": item["title"],
+        "author": item["author"],
+        "pub_date": item["pub_date"],
+        "description": strip_html_to_text(item["description_html"]),
+        "link": item["link"] or url,
+        "content_html": item["content_html"],
+        "content_text": content_text,
+        "word_count": len(content_text.split()),
+    }
+
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+def _parse_article_html(html: str, url: str) -> Dict:
+    soup = BeautifulSoup(html, "html.parser")
 
     # Extract title from meta or h1
     title = ""
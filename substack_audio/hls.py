@@ -0,0 +1,100 @@
+"""Progressive HLS output: MP3 chunks become packed-audio segments as they finish."""
+
+import math
+import os
+import struct
+from pathlib import Path
+from typing import List, Tuple
+
+from substack_audio.integrity import iter_frames
+
+_TIMESTAMP_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+
+def timestamp_tag(seconds: float) -> bytes:
+    """The ID3v2.4 PRIV tag every packed-audio segment must start with (RFC 8216 §3.4).
+
+    It carries the segment's start as a 33-bit MPEG-2 timestamp in 90 kHz units.
+    """
+    ts = round(seconds * 90000) & ((1 << 33) - 1)
+    body = _TIMESTAMP_OWNER + struct.pack(">Q", ts)
+    frame = b"PRIV" + _synchsafe(len(body)) + b"\x00\x00" + body
+    return b"ID3\x04\x00\x00" + _synchsafe(len(frame)) + frame
+
+
+def _synchsafe(n: int) -> bytes:
+    return bytes((n >> shift) & 0x7F for shift in (21, 14, 7, 0))
+
+
+class HlsPlaylist:
+    """An EVENT playlist that grows one synthesized chunk at a time.
+
+    Each chunk's MP3 frames are cut at frame boundaries into segments of at
+    most ``target_duration`` seconds. The bytes are copied, never re-encoded,
+    behind a `timestamp_tag` holding the segment's running start time. The
+    playlist is rewritten atomically after every chunk so players can start
+    while synthesis continues. `close` adds EXT-X-ENDLIST.
+    """
+
+    def __init__(self, directory: Path, target_duration: int = 10):
+        self.directory = directory
+        self.playlist = directory / "index.m3u8"
+        self.target_duration = target_duration
+        self.segments: List[Tuple[str, float]] = []
+        self.closed = False
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob("seg-*.mp3"):
+            stale.unlink()
+        self._write()
+
+    def add_chunk(self, audio_bytes: bytes) -> int:
+        """Append one chunk's audio; returns the number of segments written."""
+        start = None
+        stop = 0
+        seconds = 0.0
+        added = 0
+        for pos, length, duration in iter_frames(audio_bytes):
+            if start is not None and seconds + duration > self.target_duration:
+                self._add_segment(audio_bytes[start:stop], seconds)
+                added += 1
+                start = None
+            if start is None:
+                start = pos
+                seconds = 0.0
+            stop = pos + length
+            seconds += duration
+        if start is not None:
+            self._add_segment(audio_bytes[start:stop], seconds)
+            added += 1
+        self._write()
+        return added
+
+    def close(self) -> None:
+        self.closed = True
+        self._write()
+
+    def _add_segment(self, data: bytes, seconds: float) -> None:
+        name = f"seg-{len(self.segments) + 1:05d}.mp3"
+        (self.directory / name).write_bytes(timestamp_tag(self.duration_seconds) + data)
+        self.segments.append((name, seconds))
+
+    def _write(self) -> None:
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self.target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+        ]
+        for name, seconds in self.segments:
+            lines.append(f"#EXTINF:{seconds:.3f},")
+            lines.append(name)
+        if self.closed:
+            lines.append("#EXT-X-ENDLIST")
+        tmp = self.playlist.with_name(f".{self.playlist.name}.tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp, self.playlist)
+
+    @property
+    def duration_seconds(self) -> float:
+        return math.fsum(seconds for _, seconds in self.segments)
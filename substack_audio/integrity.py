@@ -0,0 +1,252 @@
+"""Audio store integrity: cross-check episodes.json against the audio directory."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from substack_audio.publish import file_sha256
+from substack_audio.trace import span
+
+# kbps by [version is MPEG-1][layer]; index 0 ("free") and 15 (bad) are invalid.
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by version bits: 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1.
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+def _frame_info(data: bytes, pos: int):
+    """(frame length, samples, sample rate) of the MPEG audio frame at ``pos``, or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = 4 - ((data[pos + 1] >> 1) & 0x03)
+    bitrate_idx = data[pos + 2] >> 4
+    rate_idx = (data[pos + 2] >> 2) & 0x03
+    padding = (data[pos + 2] >> 1) & 0x01
+    if version == 1 or layer == 4 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+
+
+def _id3v2_size(data: bytes, pos: int) -> int:
+    if data[pos:pos + 3] != b"ID3" or pos + 10 > len(data):
+        return 0
+    size = 0
+    for b in data[pos + 6:pos + 10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if data[pos + 5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _walk(data: bytes) -> Iterator[Tuple[str, int, int, float]]:
+    """Yield ``(kind, offset, length, seconds)`` spans covering ``data``.
+
+    ``kind`` is ``frame``, ``tag`` (ID3v2, also mid-file), ``junk`` (a run of
+    bytes that are neither) or ``truncated`` (a last frame cut short). A
+    trailing ID3v1 tag is left out.
+    """
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+    pos = 0
+    junk = None
+    while pos < end:
+        tag = _id3v2_size(data, pos)
+        info = None if tag else _frame_info(data, pos)
+        if not tag and info is None:
+            if junk is None:
+                junk = pos
+            pos += 1
+            continue
+        if junk is not None:
+            yield "junk", junk, pos - junk, 0.0
+            junk = None
+        if tag:
+            yield "tag", pos, tag, 0.0
+            pos += tag
+            continue
+        length, samples, sample_rate = info
+        if pos + length > end:
+            yield "truncated", pos, end - pos, 0.0
+            return
+        yield "frame", pos, length, samples / sample_rate
+        pos += length
+    if junk is not None:
+        yield "junk", junk, end - junk, 0.0
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, int, float]]:
+    """Yield ``(offset, length, seconds)`` for each complete MPEG audio frame in ``data``.
+
+    Tags and stray bytes between frames are stepped over.
+    """
+    for kind, pos, length, seconds in _walk(data):
+        if kind == "frame":
+            yield pos, length, seconds
+
+
+def scan_mp3(path: Path) -> Dict:
+    """Walk every MPEG audio frame in ``path``.
+
+    ID3v2 tags (also mid-file, as left by naive concatenation) and a trailing
+    ID3v1 tag are skipped. Bytes that are neither are counted in
+    ``skipped_bytes``; a last frame cut short sets ``truncated``.
+    """
+    frames = 0
+    skipped = 0
+    seconds = 0.0
+    truncated = False
+    for kind, _, length, duration in _walk(path.read_bytes()):
+        if kind == "frame":
+            frames += 1
+            seconds += duration
+        elif kind == "junk":
+            skipped += length
+        elif kind == "truncated":
+            truncated = True
+            skipped += length
+
+    return {
+        "frames": frames,
+        "duration_seconds": round(seconds, 2),
+        "skipped_bytes": skipped,
+        "truncated": truncated,
+        "valid": frames > 0 and skipped == 0,
+    }
+
+
+def episode_files(ep: Dict) -> List[Dict]:
+    """The main file entry followed by the episode's rendition entries."""
+    files = [{"audio_file": ep["audio_file"], "audio_size_bytes": ep.get("audio_size_bytes")}]
+    for rendition in (ep.get("renditions") or {}).values():
+        files.append(rendition)
+    return files
+
+
+def _check_episode(ep: Dict, audio_dir: Path, hashes: bool, frames: bool) -> List[Dict]:
+    problems = []
+    for i, entry in enumerate(episode_files(ep)):
+        path = audio_dir / entry["audio_file"]
+        where = {"guid": ep.get("guid"), "audio_file": entry["audio_file"]}
+        if not path.exists():
+            problems.append({**where, "problem": "missing"})
+            continue
+        size = path.stat().st_size
+        expected = entry.get("audio_size_bytes")
+        if expected is not None and int(expected) != size:
+            problems.append({**where, "problem": "size_mismatch", "expected": expected, "actual": size})
+        # Renditions are hashed only once they are in the blob store.
+        recorded = (ep if i == 0 else entry).get("audio_sha256")
+        if hashes and recorded:
+            if file_sha256(path) != recorded:
+                problems.append({**where, "problem": "hash_mismatch"})
+        elif hashes and i == 0:
+            problems.append({**where, "problem": "unhashed"})
+        if frames:
+            scan = scan_mp3(path)
+            if not scan["valid"]:
+                problems.append({**where, "problem": "invalid_mp3", **scan})
+    return problems
+
+
+def _stem(file_name: str) -> str:
+    # "2026-02-01-slug.mono64.mp3" -> "2026-02-01-slug"; slugs never contain dots.
+    return file_name.split(".", 1)[0]
+
+
+def find_orphans(episodes: Iterable[Dict], audio_dir: Path) -> List[Dict]:
+    """MP3s in ``audio_dir`` that no episode refers to.
+
+    Renditions and voice variants (``<stem>.<suffix>.mp3``) of a live episode
+    are kept, as are in-progress ``.part`` files (see ``cleanup``).
+    """
+    live = {_stem(ep["audio_file"]) for ep in episodes if ep.get("audio_file")}
+    orphans = []
+    if not audio_dir.exists():
+        return orphans
+    for path in sorted(audio_dir.glob("*.mp3")):
+        if path.name.startswith(".") or ".part" in path.name:
+            continue
+        if _stem(path.name) not in live:
+            orphans.append({"audio_file": path.name, "bytes": path.stat().st_size})
+    return orphans
+
+
+def verify_audio(
+    episodes: List[Dict],
+    audio_dir: Path,
+    hashes: bool = False,
+    frames: bool = False,
+    workers: int = 8,
+) -> Dict:
+    """Check every episode's audio (and renditions) in parallel; list orphans.
+
+    Sizes are always compared with ``audio_size_bytes``. ``hashes`` compares
+    the main file with ``audio_sha256`` and ``frames`` walks every MP3 frame.
+    """
+    episodes = [ep for ep in episodes if ep.get("audio_file")]
+    with span("verify.audio", episodes=len(episodes), hashes=hashes, frames=frames):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda ep: _check_episode(ep, audio_dir, hashes, frames), episodes)
+            problems = [p for per_episode in results for p in per_episode]
+    orphans = find_orphans(episodes, audio_dir)
+
+    counts: Dict[str, int] = {}
+    for p in problems:
+        counts[p["problem"]] = counts.get(p["problem"], 0) + 1
+    return {
+        "episodes_checked": len(episodes),
+        # Episodes from before hashes were recorded are reported, not failed.
+        "ok": all(p["problem"] == "unhashed" for p in problems),
+        "problem_counts": counts,
+        "problems": problems,
+        "orphans": orphans,
+        "orphan_bytes": sum(o["bytes"] for o in orphans),
+    }
+
+
+def collect_garbage(episodes: List[Dict], audio_dir: Path, dry_run: bool = False) -> Dict:
+    """Delete orphaned MP3s (see `find_orphans`); with ``dry_run`` only list them."""
+    orphans = find_orphans(episodes, audio_dir)
+    removed: List[str] = []
+    failed: List[Dict] = []
+    if not dry_run:
+        for orphan in orphans:
+            try:
+                (audio_dir / orphan["audio_file"]).unlink()
+                removed.append(orphan["audio_file"])
+            except OSError as e:
+                failed.append({"audio_file": orphan["audio_file"], "error": str(e)})
+    return {
+        "dry_run": dry_run,
+        "orphans": orphans,
+        "bytes_reclaimable": sum(o["bytes"] for o in orphans),
+        "removed": removed,
+        "failed": failed,
+    }
+
+
+def hash_audio(episodes: Iterable[Dict], audio_dir: Path, only_missing: bool = True) -> int:
+    """Record ``audio_sha256`` on episodes whose main file exists; returns how many."""
+    count = 0
+    for ep in episodes:
+        if only_missing and ep.get("audio_sha256"):
+            continue
+        path = audio_dir / ep.get("audio_file", "")
+        if ep.get("audio_file") and path.exists():
+            ep["audio_sha256"] = file_sha256(path)
+            count += 1
+    return count
+
@@ -2,7 +2,7 @@
 
 import json
 import xml.etree.ElementTree as ET
-from typing import Dict, List
+from typing import Container, Dict, Iterable, Iterator, List, Optional
 
 from bs4 import BeautifulSoup
 
@@ -17,48 +17,71 @@ def strip_html_to_text(html: str) -> str:
     return "\n\n".join(lines)
 
 
+_RSS_CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+_RSS_DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+
+def _iter_end_elements(feed_xml: str, block: int = 64 * 1024) -> Iterator[ET.Element]:
+    # Fed as str, not bytes: the text is already decoded, so a stale
+    # encoding="ISO-8859-1" declaration must not make expat decode it again.
+    parser = ET.XMLPullParser(events=("end",))
+    for start in range(0, len(feed_xml), block):
+        parser.feed(feed_xml[start:start + block])
+        for _, elem in parser.read_events():
+            yield elem
+    parser.close()
+    for _, elem in parser.read_events():
+        yield elem
+
+
+def iter_rss(feed_xml: str, skip_guids: Optional[Container[str]] = None) -> Iterator[Dict]:
+    """Yield RSS items one at a time, clearing parsed elements as we go.
+
+    Items whose guid is in ``skip_guids`` are dropped before their HTML is read.
+    """
+    for elem in _iter_end_elements(feed_xml):
+        if elem.tag != "item":
+            continue
+
+        title = (elem.findtext("title") or "Untitled").strip()
+        link = (elem.findtext("link") or "").strip()
+        guid = (elem.findtext("guid") or link or title).strip()
+        if skip_guids is not None and guid in skip_guids:
+            elem.clear()
+            continue
+        pub_date = (elem.findtext("pubDate") or "").strip()
+        description = elem.findtext("description") or ""
+        encoded = elem.findtext(f"{_RSS_CONTENT_NS}encoded")
+        content_encoded = encoded or description
+        author = elem.findtext(f"{_RSS_DC_NS}creator") or ""
+        elem.clear()
+
+        yield {
+            "title": title,
+            "link": link,
+            "guid": guid,
+            "pub_date": pub_date,
+            "description_html": description,
+            "content_html": content_encoded,
+            "author": author.strip(),
+            # False when content_html is only a stand-in (description / snippet).
+            "has_body": bool((encoded or "").strip()),
+        }
+
+
 def parse_rss(feed_xml: str) -> List[Dict]:
-    ns = {
-        "content": "http://purl.org/rss/1.0/modules/content/",
-        "dc": "http://purl.org/dc/elements/1.1/",
-    }
-
-    root = ET.fromstring(feed_xml)
-    channel = root.find("channel")
-    if channel is None:
-        return []
-
-    items = []
-    for item in channel.findall("item"):
-        title = (item.findtext("title") or "Untitled").strip()
-        link = (item.findtext("link") or "").strip()
-        guid = (item.findtext("guid") or link or title).strip()
-        pub_date = (item.findtext("pubDate") or "").strip()
-        description = item.findtext("description") or ""
-        content_encoded = item.findtext("content:encoded", namespaces=ns) or description
-        author = item.findtext("dc:creator", namespaces=ns) or ""
-
-        items.append(
-            {
-                "title": title,
-                "link": link,
-                "guid": guid,
-                "pub_date": pub_date,
-                "description_html": description,
-                "content_html": content_encoded,
-                "author": author.strip(),
-            }
-        )
-
-    return items
+    return list(iter_rss(feed_xml))
 
 
-def _parse_substack_json_rows(rows: list) -> List[Dict]:
-    items: List[Dict] = []
+def _iter_substack_json_rows(
+    rows: Iterable, skip_guids: Optional[Container[str]] = None
+) -> Iterator[Dict]:
     for row in rows:
         title = (row.get("title") or "Untitled").strip()
         link = (row.get("canonical_url") or "").strip()
         guid = str(row.get("id") or link or title).strip()
+        if skip_guids is not None and guid in skip_guids:
+            continue
         pub_date = (row.get("post_date") or "").strip()
         description = (row.get("description") or row.get("subtitle") or "").strip()
         content_html = row.get("body_html") or row.get("truncated_body_text") or description
@@ -69,18 +92,27 @@ def _parse_substack_json_rows(rows: list) -> List[Dict]:
             first = bylines[0] or {}
             author = (first.get("name") or "").strip()
 
-        items.append(
-            {
-                "title": title,
-                "link": link,
-                "guid": guid,
-                "pub_date": pub_date,
-                "description_html": description,
-                "content_html": content_html,
-                "author": author,
-            }
-        )
-    return items
+        yield {
+            "title": title,
+            "link": link,
+            "guid": guid,
+            "pub_date": pub_date,
+            "description_html": description,
+            "content_html": content_html,
+            "author": author,
+            "has_body": bool((row.get("body_html") or "").strip()),
+        }
+
+
+def _parse_substack_json_rows(rows: list) -> List[Dict]:
+    return list(_iter_substack_json_rows(rows))
+
+
+def iter_posts_json(
+    posts_json: str, skip_guids: Optional[Container[str]] = None
+) -> Iterator[Dict]:
+    """Yield items from a posts or archive API payload, skipping known guids."""
+    return _iter_substack_json_rows(json.loads(posts_json), skip_guids)
 
 
 def parse_archive_json(archive_json: str) -> List[Dict]:
@@ -124,3 +156,7 @@ def item_matches_selector(item: Dict, selector: str) -> bool:
 
 def select_items(items: List[Dict], selectors: List[str]) -> List[Dict]:
     return [it for it in items if any(item_matches_selector(it, sel) for sel in selectors)]
+
+
+def iter_select_items(items: Iterable[Dict], selectors: List[str]) -> Iterator[Dict]:
+    return (it for it in items if any(item_matches_selector(it, sel) for sel in selectors))
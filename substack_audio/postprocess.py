@@ -0,0 +1,181 @@
+"""Audio post-processing: loudness normalization and low-bitrate renditions."""
+
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from substack_audio.feed import build_audio_url
+from substack_audio.trace import span
+from substack_audio.tts import ffmpeg_available
+
+# Rendition name -> ffmpeg encode settings. The name is also the file suffix:
+# `2026-02-09-post.mp3` -> `2026-02-09-post.mono64.mp3`.
+RENDITION_PRESETS: Dict[str, Dict] = {
+    "mono64": {"bitrate": "64k", "channels": 1},
+    "mono48": {"bitrate": "48k", "channels": 1},
+    "stereo96": {"bitrate": "96k", "channels": 2},
+}
+
+
+def output_format_bitrate(output_format: str) -> str:
+    """Map an ElevenLabs format such as ``mp3_44100_128`` to an ffmpeg bitrate."""
+    tail = output_format.rsplit("_", 1)[-1]
+    return f"{tail}k" if tail.isdigit() else "128k"
+
+
+def check_renditions(renditions: List[str]) -> None:
+    """Raise ValueError for names not in `RENDITION_PRESETS`; call before any synthesis."""
+    unknown = [r for r in renditions if r not in RENDITION_PRESETS]
+    if unknown:
+        raise ValueError(
+            f"Unknown audio rendition(s): {', '.join(unknown)} "
+            f"(known: {', '.join(RENDITION_PRESETS)})"
+        )
+
+
+def rendition_file_name(audio_file: str, rendition: str) -> str:
+    stem = audio_file[:-4] if audio_file.endswith(".mp3") else audio_file
+    return f"{stem}.{rendition}.mp3"
+
+
+def rendition_entry(
+    audio_dir: Path, audio_file: str, rendition: str, public_base_url: str
+) -> Optional[Dict]:
+    """Describe an existing rendition file for the episode store, or None if absent."""
+    name = rendition_file_name(audio_file, rendition)
+    path = audio_dir / name
+    if not path.exists():
+        return None
+    return {
+        "audio_file": name,
+        "audio_url": build_audio_url(public_base_url, name),
+        "audio_size_bytes": path.stat().st_size,
+    }
+
+
+def _run_ffmpeg(args: List[str]) -> None:
+    subprocess.run(
+        ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def normalize_loudness(audio_path: Path, target_lufs: float, bitrate: str) -> None:
+    """Apply EBU R128 loudness normalization to ``audio_path`` in place."""
+    tmp = audio_path.with_name(f".{audio_path.stem}.norm.tmp.mp3")
+    try:
+        _run_ffmpeg([
+            "-i", str(audio_path),
+            "-af", f"loudnorm=I={target_lufs}:TP=-1.5:LRA=11",
+            "-ar", "44100",
+            "-b:a", bitrate,
+            str(tmp),
+        ])
+        os.replace(tmp, audio_path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def encode_rendition(audio_path: Path, rendition: str) -> Path:
+    preset = RENDITION_PRESETS[rendition]
+    out = audio_path.with_name(rendition_file_name(audio_path.name, rendition))
+    # Never overwrite in place: ``out`` may be a hard link into the blob store.
+    tmp = out.with_name(f".{out.stem}.tmp.mp3")
+    try:
+        _run_ffmpeg([
+            "-i", str(audio_path),
+            "-ac", str(preset["channels"]),
+            "-b:a", preset["bitrate"],
+            str(tmp),
+        ])
+        os.replace(tmp, out)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return out
+
+
+def postprocess_audio(
+    audio_path: Path,
+    normalize: bool,
+    renditions: List[str],
+    target_lufs: float = -16.0,
+    bitrate: str = "128k",
+) -> Dict:
+    """Normalize one final MP3 and encode its renditions. Runs in a worker process."""
+    if normalize:
+        normalize_loudness(audio_path, target_lufs, bitrate)
+    produced = {name: encode_rendition(audio_path, name).name for name in renditions}
+    return {
+        "audio_file": audio_path.name,
+        "audio_size_bytes": audio_path.stat().st_size,
+        "renditions": produced,
+    }
+
+
+def _failure(audio_path: Path, renditions: List[str], exc: Exception) -> Dict:
+    # The final MP3 is only ever replaced atomically, so it is still usable.
+    error = str(exc)
+    stderr = getattr(exc, "stderr", None)
+    if stderr:
+        lines = stderr.decode("utf-8", "replace").strip().splitlines()
+        error = f"{error} ({lines[-1]})" if lines else error
+    produced = {}
+    for name in renditions:
+        file_name = rendition_file_name(audio_path.name, name)
+        if (audio_path.parent / file_name).exists():
+            produced[name] = file_name
+    return {
+        "audio_file": audio_path.name,
+        "audio_size_bytes": audio_path.stat().st_size,
+        "renditions": produced,
+        "error": error,
+    }
+
+
+def postprocess_many(
+    audio_paths: List[Path],
+    normalize: bool,
+    renditions: List[str],
+    target_lufs: float = -16.0,
+    bitrate: str = "128k",
+    max_workers: Optional[int] = None,
+) -> List[Dict]:
+    """Post-process several episodes in a process pool; results keep input order.
+
+    An episode whose ffmpeg run fails gets a result with ``error`` (and the
+    renditions that do exist) instead of failing the batch.
+    """
+    check_renditions(renditions)
+    if not audio_paths or (not normalize and not renditions):
+        return []
+    if not ffmpeg_available():
+        print("ffmpeg not found; skipping audio post-processing", file=sys.stderr)
+        return []
+
+    with span("audio.postprocess", episodes=len(audio_paths), renditions=renditions):
+        if len(audio_paths) == 1:
+            path = audio_paths[0]
+            try:
+                return [postprocess_audio(path, normalize, renditions, target_lufs, bitrate)]
+            except Exception as exc:
+                return [_failure(path, renditions, exc)]
+
+        workers = min(max_workers or os.cpu_count() or 1, len(audio_paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(postprocess_audio, path, normalize, renditions, target_lufs, bitrate)
+                for path in audio_paths
+            ]
+            results = []
+            for path, future in zip(audio_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    results.append(_failure(path, renditions, exc))
+            return results
@@ -0,0 +1,159 @@
+"""Incremental publishing: copy only new or changed files from output/public."""
+
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from substack_audio.trace import span
+from substack_audio.util import link_or_copy, load_json, save_json
+
+# Top-level files (and their .gz/.br siblings) copied after everything else,
+# so the published feed never points at audio the target does not have yet.
+_PUBLISH_LAST = ("feed.xml", "etags.json")
+
+# Files this code writes on the way to a final name: ``.{name}.tmp``,
+# ``.{name}.link.tmp``, ``.{stem}.tmp.mp3`` and TTS ``{stem}.partN.mp3`` chunks.
+# Other dotfiles (``.htaccess``, ``.nojekyll``) are published.
+_TEMP_NAME = re.compile(r"^\..*\.tmp(?:\.mp3)?$|\.part\d+\.mp3$")
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def scan_tree(root: Path, previous: Optional[Dict] = None, workers: int = 8) -> Dict[str, Dict]:
+    """Map each file under ``root`` to its size, mtime and sha256.
+
+    Hashes from ``previous`` are reused when size and mtime are unchanged, so
+    historical MP3s are not re-read on every publish.
+    """
+    previous = previous or {}
+    entries: Dict[str, Dict] = {}
+    to_hash: List[str] = []
+
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        rel = path.relative_to(root).as_posix()
+        if _TEMP_NAME.search(path.name):
+            continue
+        st = path.stat()
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        old = previous.get(rel)
+        if old and old.get("size") == entry["size"] and old.get("mtime_ns") == entry["mtime_ns"]:
+            entry["sha256"] = old["sha256"]
+        else:
+            to_hash.append(rel)
+        entries[rel] = entry
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rel, digest in zip(to_hash, pool.map(lambda r: file_sha256(root / r), to_hash)):
+            entries[rel]["sha256"] = digest
+
+    return entries
+
+
+def compute_delta(current: Dict[str, Dict], published: Dict[str, Dict]) -> Dict[str, List[str]]:
+    changed = [
+        rel for rel, entry in current.items()
+        if published.get(rel, {}).get("sha256") != entry["sha256"]
+    ]
+    removed = [rel for rel in published if rel not in current]
+    return {"changed": changed, "removed": removed}
+
+
+def _copy_file(src: Path, dst: Path) -> int:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return src.stat().st_size
+
+
+def publish_tree(
+    source: Path,
+    target: Path,
+    manifest_file: Path,
+    workers: int = 8,
+    dry_run: bool = False,
+    delete: bool = False,
+) -> Dict:
+    """Copy the delta between ``source`` and the last publish to ``target``.
+
+    ``manifest_file`` stores, per target, the path -> size/mtime/hash map of
+    what was last published there. Content the target already holds under
+    another path is hard-linked (or copied) on the target, not sent again.
+    """
+    manifest = load_json(manifest_file, {})
+    target_key = str(target.resolve())
+    published: Dict[str, Dict] = manifest.get(target_key, {})
+
+    with span("publish.scan", source=str(source)) as sp:
+        current = scan_tree(source, previous=published, workers=workers)
+        sp.set("files", len(current))
+    delta = compute_delta(current, published)
+    # A file deleted on the target since the last publish is copied again.
+    delta["changed"] += [
+        rel for rel in current
+        if rel not in delta["changed"] and not (target / rel).exists()
+    ]
+
+    # Content the target already has (or gets earlier in this run) is linked
+    # there rather than copied again, e.g. an episode renamed after a title
+    # edit. Files about to be removed still count: links outlive them.
+    at_target = {
+        entry["sha256"]: rel for rel, entry in published.items()
+        if rel not in delta["changed"] and (target / rel).exists()
+    }
+    linked: Dict[str, str] = {}
+    for rel in delta["changed"]:
+        if rel.startswith(_PUBLISH_LAST):
+            continue
+        digest = current[rel]["sha256"]
+        if digest in at_target:
+            linked[rel] = at_target[digest]
+        else:
+            at_target[digest] = rel
+    bytes_to_copy = sum(current[rel]["size"] for rel in delta["changed"] if rel not in linked)
+
+    result = {
+        "source": str(source),
+        "target": str(target),
+        "files_total": len(current),
+        "files_copied": len(delta["changed"]) - len(linked),
+        "files_linked": len(linked),
+        "files_removed": len(delta["removed"]) if delete else 0,
+        "bytes_copied": bytes_to_copy,
+        "bytes_total": sum(e["size"] for e in current.values()),
+        "copied": [rel for rel in delta["changed"] if rel not in linked],
+        "linked": linked,
+        "removed": delta["removed"] if delete else [],
+        "dry_run": dry_run,
+    }
+    if dry_run:
+        return result
+
+    last = [rel for rel in delta["changed"] if rel.startswith(_PUBLISH_LAST)]
+    first = [rel for rel in delta["changed"] if rel not in last and rel not in linked]
+    with span("publish.copy", files=len(delta["changed"]), bytes=bytes_to_copy):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda rel: _copy_file(source / rel, target / rel), first))
+            list(pool.map(lambda rel: link_or_copy(target / linked[rel], target / rel), linked))
+            list(pool.map(lambda rel: _copy_file(source / rel, target / rel), last))
+
+    if delete:
+        for rel in delta["removed"]:
+            try:
+                (target / rel).unlink()
+            except FileNotFoundError:
+                pass
+
+    manifest[target_key] = current
+    save_json(manifest_file, manifest)
+    return result
@@ -0,0 +1,96 @@
+"""Run scheduling: pack posts into a run under ElevenLabs character and time budgets."""
+
+from typing import Dict, Iterable, List, Optional
+
+from substack_audio.parse import strip_html_to_text
+from substack_audio.textfilter import Rules, filter_text
+from substack_audio.tts import iter_chunks
+from substack_audio.util import parse_pub_date
+
+PRIORITIES = ("oldest", "newest", "shortest")
+
+
+def measure_item(item: Dict, text_limit: int, rules: Optional[Rules] = None) -> Dict:
+    """Count the characters a post will send to ElevenLabs, chunk by chunk.
+
+    Accepts raw feed items (filtered with ``rules``) or items already prepared
+    by `extract.prepare_item`.
+    """
+    if "chunks" in item:
+        pieces = item["chunks"]
+    else:
+        text, _ = filter_text(strip_html_to_text(item["content_html"]), rules)
+        pieces = iter_chunks(text, text_limit)
+    chars = 0
+    chunks = 0
+    for chunk in pieces:
+        chars += len(chunk)
+        chunks += 1
+    return {
+        "guid": item["guid"],
+        "title": item["title"],
+        "pub_date": item["pub_date"],
+        "chars": chars,
+        "chunks": chunks,
+    }
+
+
+def _priority_key(priority: str):
+    if priority == "newest":
+        return lambda m: -parse_pub_date(m["pub_date"]).timestamp()
+    if priority == "shortest":
+        return lambda m: (m["chars"], parse_pub_date(m["pub_date"]))
+    return lambda m: parse_pub_date(m["pub_date"])
+
+
+def plan_run(
+    items: Iterable[Dict],
+    text_limit: int,
+    char_budget: int = 0,
+    time_budget_seconds: float = 0,
+    chars_per_second: float = 100.0,
+    max_posts: int = 0,
+    priority: str = "oldest",
+    rules: Optional[Rules] = None,
+) -> Dict:
+    """Choose which posts to synthesize this run.
+
+    Posts are taken in ``priority`` order and skipped (not truncated) when they
+    would overflow a budget, so later, smaller posts can still fill the run.
+    A budget or ``max_posts`` of 0 means unlimited.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown schedule priority: {priority} (use one of {', '.join(PRIORITIES)})")
+
+    measured = sorted(
+        (measure_item(it, text_limit, rules) for it in items), key=_priority_key(priority)
+    )
+
+    selected: List[Dict] = []
+    deferred: List[Dict] = []
+    chars_used = 0
+    seconds_used = 0.0
+
+    for m in measured:
+        m["est_seconds"] = round(m["chars"] / chars_per_second, 1) if chars_per_second else 0.0
+        if max_posts and len(selected) >= max_posts:
+            deferred.append({**m, "reason": "max_posts"})
+        elif char_budget and chars_used + m["chars"] > char_budget:
+            reason = "exceeds_char_budget" if m["chars"] > char_budget else "char_budget"
+            deferred.append({**m, "reason": reason})
+        elif time_budget_seconds and seconds_used + m["est_seconds"] > time_budget_seconds:
+            deferred.append({**m, "reason": "time_budget"})
+        else:
+            selected.append(m)
+            chars_used += m["chars"]
+            seconds_used += m["est_seconds"]
+
+    return {
+        "priority": priority,
+        "char_budget": char_budget,
+        "time_budget_seconds": time_budget_seconds,
+        "chars_planned": chars_used,
+        "est_seconds_planned": round(seconds_used, 1),
+        "selected": selected,
+        "deferred": deferred,
+    }
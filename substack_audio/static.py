@@ -0,0 +1,98 @@
+"""Static hosting artifacts: change-aware writes, precompressed siblings, ETag manifest."""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+from substack_audio.util import ensure_parent, load_json
+
+MANIFEST_NAME = "etags.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    ensure_parent(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _compressed_siblings(data: bytes) -> Dict[str, bytes]:
+    # mtime=0 keeps the gzip header, and therefore the .gz bytes, deterministic.
+    out = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out[".br"] = brotli.compress(data)
+    return out
+
+
+def write_static(path: Path, data: bytes, public_root: Path) -> bool:
+    """Write ``data`` plus .gz/.br siblings only if the content changed.
+
+    The file's hash is recorded in ``<public_root>/etags.json`` so static hosts
+    can serve a stable ETag. Returns True when the file was (re)written.
+    """
+    digest = content_hash(data)
+    siblings = _compressed_siblings(data)
+    unchanged = (
+        path.exists()
+        and content_hash(path.read_bytes()) == digest
+        and all(path.with_name(path.name + ext).exists() for ext in siblings)
+    )
+    if not unchanged:
+        _write_atomic(path, data)
+        for ext, blob in siblings.items():
+            _write_atomic(path.with_name(path.name + ext), blob)
+        stale_br = path.with_name(path.name + ".br")
+        if brotli is None and stale_br.exists():
+            stale_br.unlink()
+
+    rel = path.resolve().relative_to(public_root.resolve()).as_posix()
+    _record_etag(public_root, rel, {
+        "sha256": digest,
+        "etag": f'"{digest[:32]}"',
+        "bytes": len(data),
+        "encodings": {ext.lstrip("."): len(blob) for ext, blob in siblings.items()},
+    })
+    return not unchanged
+
+
+def write_static_json(path: Path, data, public_root: Path) -> bool:
+    payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return write_static(path, payload, public_root)
+
+
+def _save_manifest(public_root: Path, manifest: Dict) -> None:
+    manifest_path = public_root / MANIFEST_NAME
+    payload = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    _write_atomic(manifest_path, payload)
+    for ext, blob in _compressed_siblings(payload).items():
+        _write_atomic(manifest_path.with_name(manifest_path.name + ext), blob)
+
+
+def _record_etag(public_root: Path, rel: str, entry: Dict) -> None:
+    manifest = load_json(public_root / MANIFEST_NAME, {})
+    if manifest.get(rel) != entry:
+        manifest[rel] = entry
+        _save_manifest(public_root, manifest)
+
+
+def forget_static(path: Path, public_root: Path) -> None:
+    """Remove a file, its compressed siblings and its manifest entry."""
+    for candidate in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+        if candidate.exists():
+            candidate.unlink()
+    manifest = load_json(public_root / MANIFEST_NAME, {})
+    rel = path.resolve().relative_to(public_root.resolve()).as_posix()
+    if manifest.pop(rel, None) is not None:
+        _save_manifest(public_root, manifest)
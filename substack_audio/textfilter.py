@@ -0,0 +1,109 @@
+"""Pre-synthesis text filter: drop Substack boilerplate and non-speech text before chunking."""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from substack_audio.config import env, env_bool
+
+Rules = Tuple[Tuple[str, str], ...]
+
+# Paragraph-level rules match a whole paragraph of `strip_html_to_text` output
+# (paragraphs are separated by blank lines); inline rules match anywhere. The
+# filter is on by default and also runs on approved narratives, so paragraph
+# rules only match Substack's own button, caption and footer strings.
+_PARAGRAPH_RULES: Rules = (
+    ("subscribe", r"(?:Subscribe(?: now| for free)?|Upgrade to paid|Get \d+ day free trial"
+                  r"|Give a gift subscription|Type your email\W*|Pledge your support)"),
+    ("thanks_for_reading", r"Thanks for reading [^\n]{0,120}(?:Subscribe|subscribe)[^\n]*"),
+    ("share", r"(?:Share|Share this post|Restack|Like|Comment|Leave a comment"
+              r"|Discussion about this post|Listen now|Read more|Ready for more\?)"),
+    ("footnote_marker", r"\[\d{1,3}\]"),
+    ("caption", r"(?:(?:Photo|Image|Illustration) by [^\n]{1,80} on (?:Unsplash|Pexels|Pixabay)"
+                r"|(?:Photo|Image) credit: [^\n]{1,120})"),
+    ("copyright", r"(?:©|\(c\)) ?\d{4}[^\n]{0,120}"),
+)
+_INLINE_RULES: Rules = (
+    ("url", r"(?:https?://|www\.)[^\s)\]>]*[^\s)\]>.,;:!?'\"]"),
+    ("footnote_ref", r"\[\d{1,3}\]"),
+)
+
+BUILTIN_RULES: Rules = tuple(
+    (name, rf"(?m:^(?:{pattern})[ \t]*(?:\n\n|\Z))") for name, pattern in _PARAGRAPH_RULES
+) + _INLINE_RULES
+
+
+# Backreferences: \1-\99, \g<...> and (?P=name).
+_BACKREF = re.compile(r"\\(?:[1-9]|g<)|\(\?P=")
+
+
+def load_patterns(path: Path) -> Tuple[str, ...]:
+    """One regex per line; blank lines and ``#`` comments are ignored.
+
+    Every pattern becomes one named group of a single alternation, so named
+    groups and backreferences are rejected with ValueError (use ``(?:...)``).
+    """
+    patterns = []
+    for lineno, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        pattern = line.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        try:
+            compiled = re.compile(pattern)
+        except re.error as exc:
+            raise ValueError(f"{path}:{lineno}: invalid pattern: {exc}") from None
+        if compiled.groupindex or _BACKREF.search(pattern):
+            raise ValueError(
+                f"{path}:{lineno}: named groups and backreferences are not supported"
+            )
+        patterns.append(pattern)
+    return tuple(patterns)
+
+
+def filter_rules(settings: Optional[Mapping[str, str]] = None) -> Optional[Rules]:
+    """The rules configured by ``TEXT_FILTER`` / ``TEXT_FILTER_PATTERNS_FILE``, or None if off.
+
+    User patterns are applied in ``re.MULTILINE`` mode, so ``^...$`` matches
+    one paragraph line.
+    """
+    if not env_bool("TEXT_FILTER", True, settings):
+        return None
+    rules = BUILTIN_RULES
+    patterns_file = env("TEXT_FILTER_PATTERNS_FILE", "", settings)
+    if patterns_file:
+        user = load_patterns(Path(patterns_file))
+        rules += tuple((f"user{i}", f"(?m:{p})") for i, p in enumerate(user, start=1))
+    return rules
+
+
+@lru_cache(maxsize=8)
+def _compile(rules: Rules) -> "re.Pattern[str]":
+    # One alternation with a named group per rule: a single scan of the text,
+    # and match.lastgroup says which rule fired.
+    return re.compile("|".join(f"(?P<r{i}>{pattern})" for i, (_, pattern) in enumerate(rules)))
+
+
+def filter_text(text: str, rules: Optional[Rules]) -> Tuple[str, Dict]:
+    """Remove everything ``rules`` match; returns the text and a removal report."""
+    if not rules:
+        return text, {"chars_in": len(text), "chars_out": len(text), "chars_removed": 0, "rules": {}}
+
+    removed: Dict[str, int] = {}
+
+    def drop(match: "re.Match[str]") -> str:
+        name = rules[int(match.lastgroup[1:])][0]
+        removed[name] = removed.get(name, 0) + len(match.group())
+        return ""
+
+    out = _compile(rules).sub(drop, text)
+    out = re.sub(r"[ \t]{2,}", " ", out)
+    out = re.sub(r"(?m)^[ \t]+|[ \t]+$", "", out)
+    out = re.sub(r"[ \t]+(?=[.,;:!?])", "", out)
+    out = re.sub(r"\n{3,}", "\n\n", out).strip()
+    return out, {
+        "chars_in": len(text),
+        "chars_out": len(out),
+        "chars_removed": len(text) - len(out),
+        "rules": removed,
+    }
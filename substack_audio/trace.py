@@ -0,0 +1,167 @@
+"""Tracing and profiling: span-based JSONL traces, Chrome trace export, cProfile hooks."""
+
+import contextvars
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+_lock = threading.Lock()
+_state: Optional[Dict] = None
+
+
+class Span:
+    def __init__(self, name: str, span_id: int, parent_id: Optional[int], attrs: Dict):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attrs = attrs
+
+    def set(self, key: str, value) -> None:
+        self.attrs[key] = value
+
+
+class _NoopSpan:
+    span_id = None
+
+    def set(self, key: str, value) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def start_tracing(path: Path) -> None:
+    """Start appending spans to ``path`` as JSON lines."""
+    global _state
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        _state = {
+            "file": path.open("a", encoding="utf-8"),
+            "pid": os.getpid(),
+            "next_id": 1,
+        }
+
+
+def stop_tracing() -> None:
+    global _state
+    with _lock:
+        if _state is not None:
+            _state["file"].close()
+            _state = None
+
+
+def tracing_enabled() -> bool:
+    # Worker processes forked from a traced parent do not write to its file.
+    return _state is not None and _state["pid"] == os.getpid()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Record a timed span nested under the current one; a no-op unless tracing."""
+    if not tracing_enabled():
+        yield _NOOP
+        return
+
+    with _lock:
+        span_id = _state["next_id"]
+        _state["next_id"] += 1
+    parent = _current_span.get()
+    sp = Span(name, span_id, parent.span_id if parent else None, dict(attrs))
+    token = _current_span.set(sp)
+    start_ns = time.time_ns()
+    t0 = time.perf_counter_ns()
+    error = None
+    try:
+        yield sp
+    except BaseException as exc:
+        error = repr(exc)
+        raise
+    finally:
+        duration_ns = time.perf_counter_ns() - t0
+        _current_span.reset(token)
+        record = {
+            "name": sp.name,
+            "span_id": sp.span_id,
+            "parent_id": sp.parent_id,
+            "start_us": start_ns // 1000,
+            "duration_us": duration_ns // 1000,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "attrs": sp.attrs,
+        }
+        if error:
+            record["error"] = error
+        line = json.dumps(record, default=str)
+        with _lock:
+            if _state is not None:
+                _state["file"].write(line + "\n")
+                _state["file"].flush()
+
+
+def to_chrome_trace(trace_file: Path, output_file: Path) -> int:
+    """Convert a JSONL span trace into Chrome trace-event JSON.
+
+    The result opens in chrome://tracing, Perfetto or speedscope. Returns the
+    number of events written.
+    """
+    events = []
+    threads: Dict[str, int] = {}
+    with trace_file.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            tid = threads.setdefault(rec.get("thread", ""), len(threads) + 1)
+            args = dict(rec.get("attrs") or {})
+            args["span_id"] = rec["span_id"]
+            if rec.get("parent_id") is not None:
+                args["parent_id"] = rec["parent_id"]
+            if rec.get("error"):
+                args["error"] = rec["error"]
+            events.append({
+                "name": rec["name"],
+                "cat": rec["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": rec["start_us"],
+                "dur": rec["duration_us"],
+                "pid": rec.get("pid", 0),
+                "tid": tid,
+                "args": args,
+            })
+    pid = events[0]["pid"] if events else 0
+    for thread_name, tid in threads.items():
+        events.append({
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": thread_name},
+        })
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+@contextmanager
+def profiled(output_file: Optional[Path]):
+    """Run the block under cProfile and dump stats to ``output_file`` (if given)."""
+    if output_file is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(output_file))
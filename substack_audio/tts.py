@@ -1,42 +1,101 @@
 """Text-to-speech: chunking, ElevenLabs API, MP3 concatenation."""
 
+import hashlib
 import os
 import subprocess
 import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List
 
 from elevenlabs.client import ElevenLabs
 
+from substack_audio.events import emit
+from substack_audio.trace import span
 
-def split_text(text: str, max_len: int) -> List[str]:
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-    chunks: List[str] = []
+
+def iter_chunks(text: str, max_len: int) -> Iterator[str]:
+    """Yield TTS-sized chunks of ``text``, split on paragraph then word boundaries."""
     cur = ""
 
-    for para in paragraphs:
+    for para in (p.strip() for p in text.split("\n\n")):
+        if not para:
+            continue
         candidate = f"{cur}\n\n{para}".strip() if cur else para
         if len(candidate) <= max_len:
             cur = candidate
             continue
 
         if cur:
-            chunks.append(cur)
+            yield cur
             cur = ""
 
         while len(para) > max_len:
             cut = para.rfind(" ", 0, max_len)
             if cut == -1:
                 cut = max_len
-            chunks.append(para[:cut].strip())
+            yield para[:cut].strip()
             para = para[cut:].strip()
 
         cur = para
 
     if cur:
-        chunks.append(cur)
+        yield cur
 
-    return chunks
+
+def split_text(text: str, max_len: int) -> List[str]:
+    return list(iter_chunks(text, max_len))
+
+
+class FairLimiter:
+    """Global cap on concurrent TTS calls, handing free slots to keys round-robin.
+
+    Each key (e.g. a publication name) waits in its own queue, so one feed with
+    many chunks cannot starve the others.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._active = 0
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, deque] = {}
+        self._turns: deque = deque()
+
+    def acquire(self, key: str = "") -> None:
+        ticket = object()
+        with self._cond:
+            queue = self._waiting.setdefault(key, deque())
+            if not queue:
+                self._turns.append(key)
+            queue.append(ticket)
+            while not (
+                self._active < self._limit and self._turns[0] == key and queue[0] is ticket
+            ):
+                self._cond.wait()
+            queue.popleft()
+            self._turns.popleft()
+            if queue:
+                self._turns.append(key)
+            else:
+                del self._waiting[key]
+            self._active += 1
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, key: str = ""):
+        self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
 
 
 def elevenlabs_tts(
@@ -57,19 +116,94 @@ def elevenlabs_tts(
     return b"".join(chunk for chunk in audio if isinstance(chunk, (bytes, bytearray)))
 
 
-def concat_mp3(parts: List[Path], output_file: Path) -> None:
-    if len(parts) == 1:
-        output_file.write_bytes(parts[0].read_bytes())
-        return
+def check_output_format(output_format: str) -> None:
+    """Raise ValueError unless ``output_format`` is an ElevenLabs MP3 format (``mp3_*``).
+
+    Chunks are saved as ``.mp3`` and joined by `concat_mp3`, so PCM, µ-law or
+    Opus output would produce unplayable files.
+    """
+    if not output_format.startswith("mp3_"):
+        raise ValueError(
+            f"Unsupported output format {output_format!r}: only mp3_* formats (e.g. mp3_44100_128) can be used"
+        )
+
+
+def chunk_cache_key(voice_id: str, model_id: str, output_format: str, text: str) -> str:
+    """Identifies one chunk's audio, e.g. a preview that generate_audio may reuse."""
+    raw = "\0".join((voice_id, model_id, output_format, text))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 
-    ffmpeg_available = False
+def synthesize_chunk(
+    client: ElevenLabs,
+    voice_id: str,
+    model_id: str,
+    output_format: str,
+    text: str,
+    index: int,
+    total: int,
+    **context,
+) -> bytes:
+    """`elevenlabs_tts` for chunk ``index`` of ``total``, traced and reported as events.
+
+    ``context`` (e.g. guid, voice_id) is added to the span and every event.
+    """
+    emit("chunk_started", index=index, total=total, chars=len(text), **context)
+    t0 = time.perf_counter()
+    with span("tts.chunk", index=index, chars=len(text), **context) as sp:
+        try:
+            audio_bytes = elevenlabs_tts(
+                client=client,
+                voice_id=voice_id,
+                model_id=model_id,
+                output_format=output_format,
+                text=text,
+            )
+        except Exception as exc:
+            emit("chunk_failed", index=index, total=total, error=str(exc), **context)
+            raise
+        sp.set("bytes", len(audio_bytes))
+    emit(
+        "chunk_completed",
+        index=index,
+        total=total,
+        bytes=len(audio_bytes),
+        latency_ms=round((time.perf_counter() - t0) * 1000),
+        **context,
+    )
+    return audio_bytes
+
+
+def ffmpeg_available() -> bool:
     try:
         subprocess.run(["ffmpeg", "-version"], check=False, capture_output=True)
-        ffmpeg_available = True
+        return True
     except FileNotFoundError:
-        ffmpeg_available = False
+        return False
+
+
+def concat_mp3(parts: List[Path], output_file: Path) -> None:
+    emit("concat_started", parts=len(parts), output=output_file.name)
+    # Written aside and swapped in: the old file may be a hard link into the blob store.
+    tmp = output_file.with_name(f".{output_file.stem}.tmp.mp3")
+    with span("audio.concat", parts=len(parts)) as sp:
+        try:
+            _concat_mp3(parts, tmp)
+            os.replace(tmp, output_file)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        size = output_file.stat().st_size
+        sp.set("bytes", size)
+    emit("concat_done", parts=len(parts), output=output_file.name, bytes=size)
+
+
+def _concat_mp3(parts: List[Path], output_file: Path) -> None:
+    if len(parts) == 1:
+        output_file.write_bytes(parts[0].read_bytes())
+        return
 
-    if ffmpeg_available:
+    if ffmpeg_available():
         with tempfile.NamedTemporaryFile("w", delete=False) as list_file:
             for part in parts:
                 list_file.write(f"file '{part.resolve()}'\n")
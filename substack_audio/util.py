@@ -2,10 +2,23 @@
 
 import email.utils
 import json
+import os
 import re
+import shutil
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from substack_audio.trace import span
+
+# ioctl(FICLONE): share extents copy-on-write (Btrfs, XFS, bcachefs).
+_FICLONE = 0x40049409
+
 
 def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -19,9 +32,51 @@ def load_json(path: Path, default):
 
 
 def save_json(path: Path, data) -> None:
-    ensure_parent(path)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Write ``data`` to a temporary sibling and rename it over ``path``.
+
+    Readers never see a half-written file.
+    """
+    with span("json.save", path=str(path)) as sp:
+        ensure_parent(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            sp.set("bytes", f.tell())
+        os.replace(tmp, path)
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError("reflinks are not supported here")
+    with src.open("rb") as s, dst.open("wb") as d:
+        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    """Give ``dst`` the content of ``src`` as a hard link, else a reflink, else a copy.
+
+    ``dst`` is replaced atomically, never written in place. Returns
+    ``"hardlink"``, ``"reflink"`` or ``"copy"``.
+    """
+    ensure_parent(dst)
+    if dst.exists() and os.path.samefile(src, dst):
+        return "hardlink"
+    tmp = dst.with_name(f".{dst.name}.link.tmp")
+    # A leftover may itself be a link; writing through it would change its twin.
+    if tmp.exists():
+        tmp.unlink()
+    for mode, make in (("hardlink", os.link), ("reflink", _reflink)):
+        try:
+            make(src, tmp)
+        except OSError:
+            if tmp.exists():
+                tmp.unlink()
+            continue
+        os.replace(tmp, dst)
+        return mode
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return "copy"
 
 
 def slugify(text: str) -> str:
@@ -39,3 +94,14 @@ def parse_pub_date(pub_date: str) -> datetime:
         return dt.astimezone(timezone.utc)
     except Exception:
         return datetime.now(timezone.utc)
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process, or 0 where unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
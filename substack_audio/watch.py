@@ -0,0 +1,77 @@
+"""Watch mode: adaptive feed polling intervals for a resident process."""
+
+import email.utils
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from substack_audio.catalog import parse_iso_date
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+def publish_minutes(episodes: Iterable[Dict], recent: int = 20) -> List[int]:
+    """Minute of day (UTC) at which the ``recent`` latest episodes were published.
+
+    Episodes whose date carries no time of day (midnight exactly) are ignored.
+    """
+    stamps = []
+    for ep in episodes:
+        try:
+            stamps.append(parse_iso_date(ep.get("pub_date_iso") or ""))
+        except ValueError:
+            continue
+    stamps.sort(reverse=True)
+    minutes = [dt.hour * 60 + dt.minute for dt in stamps[:recent]]
+    return [m for m in minutes if m]
+
+
+def near_publish_time(now: datetime, minutes: Iterable[int], window: int) -> bool:
+    """True when ``now`` is within ``window`` minutes of a typical publish time."""
+    now = now.astimezone(timezone.utc)
+    current = now.hour * 60 + now.minute
+    for m in minutes:
+        distance = abs(current - m)
+        if min(distance, _MINUTES_PER_DAY - distance) <= window:
+            return True
+    return False
+
+
+def next_interval(
+    previous: float,
+    changed: bool,
+    hot: bool,
+    min_interval: float,
+    max_interval: float,
+    backoff: float = 2.0,
+    retry_after: Optional[float] = None,
+) -> float:
+    """Seconds until the next poll.
+
+    A change or a typical publish window resets polling to ``min_interval``;
+    otherwise the interval grows by ``backoff`` up to ``max_interval``. A
+    server's Retry-After always wins over a shorter interval.
+    """
+    if changed or hot:
+        interval = min_interval
+    else:
+        interval = min(max_interval, max(min_interval, previous * backoff))
+    if retry_after is not None:
+        interval = max(interval, retry_after)
+    return interval